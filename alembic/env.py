@@ -27,6 +27,23 @@ if config.config_file_name is not None:
 # target_metadata = None
 target_metadata = Base.metadata
 
+# Full-text search objects created by raw SQL in 3b9d6a2f41c7; they are not in the
+# models, so without this autogenerate would emit drops for them
+FULL_TEXT_SEARCH_TABLES = ("articles_fts", "articles_fts_data", "articles_fts_idx",
+                           "articles_fts_docsize", "articles_fts_config")
+FULL_TEXT_SEARCH_OBJECTS = {
+    ("table", name) for name in FULL_TEXT_SEARCH_TABLES
+} | {
+    ("column", "search_vector"),
+    ("index", "ix_articles_search_vector"),
+    ("index", "ft_articles_search"),
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and (type_, name) in FULL_TEXT_SEARCH_OBJECTS)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -50,6 +67,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -75,7 +93,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
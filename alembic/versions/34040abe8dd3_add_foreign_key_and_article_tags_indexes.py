@@ -0,0 +1,55 @@
+"""Add foreign key indexes and article_tags primary key
+
+Revision ID: 34040abe8dd3
+Revises: cd9200a59751
+Create Date: 2026-10-18 12:47:29.381556
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '34040abe8dd3'
+down_revision: Union[str, None] = 'cd9200a59751'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Plain CREATE INDEX on articles; a batch copy would drop the articles_fts triggers
+    op.create_index('ix_articles_author_id_id', 'articles', ['author_id', 'id'], unique=False)
+    op.create_index('ix_comments_author_id', 'comments', ['author_id'], unique=False)
+
+    # Drop duplicate and half-empty links before they become a primary key
+    op.execute(
+        "CREATE TABLE article_tags_dedup AS SELECT DISTINCT article_id, tag_id FROM article_tags "
+        "WHERE article_id IS NOT NULL AND tag_id IS NOT NULL"
+    )
+    op.execute("DELETE FROM article_tags")
+    op.execute("INSERT INTO article_tags (article_id, tag_id) SELECT article_id, tag_id FROM article_tags_dedup")
+    op.drop_table('article_tags_dedup')
+
+    with op.batch_alter_table('article_tags') as batch_op:
+        batch_op.alter_column('article_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('tag_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_primary_key('pk_article_tags', ['article_id', 'tag_id'])
+    op.create_index('ix_article_tags_tag_id_article_id', 'article_tags', ['tag_id', 'article_id'], unique=False)
+
+    # Duplicates were counted by the usage_count backfill; recount
+    op.execute(
+        "UPDATE tags SET usage_count = "
+        "(SELECT COUNT(*) FROM article_tags WHERE article_tags.tag_id = tags.id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_article_tags_tag_id_article_id', table_name='article_tags')
+    with op.batch_alter_table('article_tags') as batch_op:
+        batch_op.drop_constraint('pk_article_tags', type_='primary')
+        batch_op.alter_column('tag_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('article_id', existing_type=sa.Integer(), nullable=True)
+    op.drop_index('ix_comments_author_id', table_name='comments')
+    op.drop_index('ix_articles_author_id_id', table_name='articles')
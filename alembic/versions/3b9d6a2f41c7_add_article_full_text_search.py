@@ -0,0 +1,70 @@
+"""Add article full-text search index
+
+Revision ID: 3b9d6a2f41c7
+Revises: 826d3d0c7192
+Create Date: 2026-10-18 10:41:17.554029
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d6a2f41c7'
+down_revision: Union[str, None] = '826d3d0c7192'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # External-content FTS5 table kept in sync with articles by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE articles_fts USING fts5("
+            "title, description, body, content='articles', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER articles_fts_ai AFTER INSERT ON articles BEGIN "
+            "INSERT INTO articles_fts(rowid, title, description, body) "
+            "VALUES (new.id, new.title, new.description, new.body); END"
+        )
+        op.execute(
+            "CREATE TRIGGER articles_fts_ad AFTER DELETE ON articles BEGIN "
+            "INSERT INTO articles_fts(articles_fts, rowid, title, description, body) "
+            "VALUES ('delete', old.id, old.title, old.description, old.body); END"
+        )
+        op.execute(
+            "CREATE TRIGGER articles_fts_au AFTER UPDATE OF title, description, body ON articles BEGIN "
+            "INSERT INTO articles_fts(articles_fts, rowid, title, description, body) "
+            "VALUES ('delete', old.id, old.title, old.description, old.body); "
+            "INSERT INTO articles_fts(rowid, title, description, body) "
+            "VALUES (new.id, new.title, new.description, new.body); END"
+        )
+        op.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+    elif dialect == 'mysql':
+        op.execute("ALTER TABLE articles ADD FULLTEXT INDEX ft_articles_search (title, description, body)")
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE articles ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'C')) STORED"
+        )
+        op.execute("CREATE INDEX ix_articles_search_vector ON articles USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS articles_fts_ai")
+        op.execute("DROP TABLE IF EXISTS articles_fts")
+    elif dialect == 'mysql':
+        op.execute("ALTER TABLE articles DROP INDEX ft_articles_search")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_articles_search_vector")
+        op.execute("ALTER TABLE articles DROP COLUMN search_vector")
@@ -0,0 +1,35 @@
+"""Add articles comments_count and comments article/id index
+
+Revision ID: 5914491b2737
+Revises: 3b9d6a2f41c7
+Create Date: 2026-10-18 11:26:40.107385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5914491b2737'
+down_revision: Union[str, None] = '3b9d6a2f41c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Plain ADD COLUMN (no batch copy) so SQLite keeps the articles_fts triggers
+    op.add_column('articles', sa.Column('comments_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_comments_article_id_id', 'comments', ['article_id', 'id'], unique=False)
+    # Backfill from the existing comments
+    op.execute(
+        "UPDATE articles SET comments_count = "
+        "(SELECT COUNT(*) FROM comments WHERE comments.article_id = articles.id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_article_id_id', table_name='comments')
+    # Native DROP COLUMN (SQLite >= 3.35); a batch copy would drop the articles_fts triggers
+    op.drop_column('articles', 'comments_count')
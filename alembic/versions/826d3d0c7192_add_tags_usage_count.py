@@ -0,0 +1,35 @@
+"""Add tags usage_count
+
+Revision ID: 826d3d0c7192
+Revises: 8eec56d8b747
+Create Date: 2026-10-18 10:03:51.902614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '826d3d0c7192'
+down_revision: Union[str, None] = '8eec56d8b747'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tags') as batch_op:
+        batch_op.add_column(sa.Column('usage_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index('ix_tags_usage_count', ['usage_count'], unique=False)
+    # Backfill from the existing links
+    op.execute(
+        "UPDATE tags SET usage_count = "
+        "(SELECT COUNT(*) FROM article_tags WHERE article_tags.tag_id = tags.id)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tags') as batch_op:
+        batch_op.drop_index('ix_tags_usage_count')
+        batch_op.drop_column('usage_count')
@@ -0,0 +1,26 @@
+"""Add todos completed/id index for keyset pagination
+
+Revision ID: 8eec56d8b747
+Revises: e2e853957099
+Create Date: 2026-10-18 09:12:04.318211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8eec56d8b747'
+down_revision: Union[str, None] = 'e2e853957099'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_todos_completed_id', 'todos', ['completed', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_completed_id', table_name='todos')
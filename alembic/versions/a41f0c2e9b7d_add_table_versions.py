@@ -0,0 +1,34 @@
+"""Add table_versions for conditional GETs
+
+Revision ID: a41f0c2e9b7d
+Revises: 34040abe8dd3
+Create Date: 2026-10-18 14:05:12.448310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f0c2e9b7d'
+down_revision: Union[str, None] = '34040abe8dd3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("todos", "users", "articles", "comments", "tags")
+
+
+def upgrade() -> None:
+    table_versions = op.create_table(
+        'table_versions',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.bulk_insert(table_versions, [{'name': name, 'version': 0} for name in VERSIONED_TABLES])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
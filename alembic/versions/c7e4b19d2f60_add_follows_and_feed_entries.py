@@ -0,0 +1,48 @@
+"""Add follows, feed_entries and users followers_count
+
+Revision ID: c7e4b19d2f60
+Revises: a41f0c2e9b7d
+Create Date: 2026-10-18 17:42:09.615204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e4b19d2f60'
+down_revision: Union[str, None] = 'a41f0c2e9b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('followers_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_users_followers_count', 'users', ['followers_count'], unique=False)
+    op.create_table(
+        'follows',
+        sa.Column('follower_id', sa.Integer(), nullable=False),
+        sa.Column('followee_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['followee_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['follower_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('follower_id', 'followee_id'),
+    )
+    op.create_index('ix_follows_followee_id_follower_id', 'follows', ['followee_id', 'follower_id'], unique=False)
+    op.create_table(
+        'feed_entries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'article_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('feed_entries')
+    op.drop_index('ix_follows_followee_id_follower_id', table_name='follows')
+    op.drop_table('follows')
+    op.drop_index('ix_users_followers_count', table_name='users')
+    op.drop_column('users', 'followers_count')
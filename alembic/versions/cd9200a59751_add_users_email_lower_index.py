@@ -0,0 +1,30 @@
+"""Add functional lower(email) index on users
+
+Revision ID: cd9200a59751
+Revises: 5914491b2737
+Create Date: 2026-10-18 12:05:13.648120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cd9200a59751'
+down_revision: Union[str, None] = '5914491b2737'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Expression indexes need SQLite >= 3.9, MySQL >= 8.0.13; fails if two
+    # existing emails differ only by case
+    op.create_index(
+        'ix_users_email_lower', 'users', [sa.func.lower(sa.column('email'))], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -0,0 +1,28 @@
+"""Version the follows table for conditional GETs
+
+Revision ID: d2a8f5c31e94
+Revises: c7e4b19d2f60
+Create Date: 2026-10-18 19:12:40.203117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8f5c31e94'
+down_revision: Union[str, None] = 'c7e4b19d2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+table_versions = sa.table('table_versions', sa.column('name', sa.String), sa.column('version', sa.Integer))
+
+
+def upgrade() -> None:
+    op.bulk_insert(table_versions, [{'name': 'follows', 'version': 0}])
+
+
+def downgrade() -> None:
+    op.execute(table_versions.delete().where(table_versions.c.name == 'follows'))
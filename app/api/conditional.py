@@ -0,0 +1,49 @@
+import hashlib
+from typing import Iterable, Optional
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import TableVersion
+
+# Cache-Control policies. no-cache lets clients keep a copy but revalidate it every time,
+# which is what makes If-None-Match cheap instead of serving stale pages.
+PUBLIC_REVALIDATE = "public, no-cache"
+PRIVATE_REVALIDATE = "private, no-cache"
+
+async def table_etag(db: AsyncSession, tables: Iterable[str], *extra) -> str:
+    """Weak ETag over the current versions of tables, plus anything else the representation depends on."""
+    names = sorted(tables)
+    result = await db.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names))
+    )
+    versions = dict(result.all())
+    key = "|".join([*(f"{name}={versions.get(name, 0)}" for name in names), *map(str, extra)])
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: W/ prefixes are ignored
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+async def conditional_get(request: Request,
+                          response: Response,
+                          db: AsyncSession,
+                          tables: Iterable[str],
+                          cache_control: str,
+                          *extra) -> Optional[Response]:
+    """Return a 304 when the client's copy is current; otherwise set ETag and Cache-Control on response.
+
+    Call before reading the data: a write that lands in between then only makes the
+    ETag older than the body, which costs the client a 200 next time, never a stale 304.
+    """
+    etag = await table_etag(db, tables, *extra)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -1,45 +1,112 @@
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
-from fastapi import Depends, HTTPException, status
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from app.db.replicas import replicas
+from app.db.session import AsyncSessionLocal
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security.utils import get_authorization_scheme_param
+from app.core.cache import recent_writers, token_cache
 from app.core.security.jwt import decode_access_token
 from app.core.security.models import CustomHTTPScheme, CustomHTTPAuthorizationCredentials
-from app.crud.user import get_user_by_id
-from app.db.models import User
+from app.crud.user import UserRow, get_cached_user_row_by_id
 
 security = CustomHTTPScheme()
 
-def get_db():
-    db = SessionLocal()
-    try:
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session on the primary. Unsafe requests by a signed-in user pin their reads there for a while."""
+    if replicas.engines and request.method not in SAFE_METHODS:
+        user_id = await get_optional_user_id(request)
+        if user_id is not None:
+            await note_write(user_id)
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def get_current_user(db: Session = Depends(get_db), token: CustomHTTPAuthorizationCredentials = Depends(security)) -> User:
-    # Define the credentials exception upfront
-    credentials_exception = HTTPException(
+async def note_write(user_id: int):
+    if replicas.engines:
+        await recent_writers.set(user_id, True)
+
+async def choose_read_engine(request: Request) -> AsyncEngine:
+    if not replicas.engines:
+        return replicas.primary
+    user_id = await get_optional_user_id(request)
+    if user_id is not None and await recent_writers.get(user_id):
+        # Read-your-writes: the replicas may not have this user's last write yet
+        return replicas.primary
+    return replicas.choose()
+
+@asynccontextmanager
+async def read_session(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    """Session on an engine from choose_read_engine; a replica that fails under it leaves the rotation."""
+    async with AsyncSessionLocal(bind=engine) as db:
+        try:
+            yield db
+        except DBAPIError as exc:
+            if exc.connection_invalidated or isinstance(exc, (OperationalError, InterfaceError)):
+                replicas.mark_down(engine)
+            raise
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session on a read replica when one is configured and healthy; only for routes that do not write."""
+    async with read_session(await choose_read_engine(request)) as db:
+        yield db
+
+async def get_token_claims(token_str: str):
+    key = hashlib.sha256(token_str.encode()).hexdigest()
+    payload = await token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = decode_access_token(token_str)
+    if payload is not None and "exp" in payload:
+        # Never cache a token beyond its own expiry
+        await token_cache.set(key, payload, ttl=payload["exp"] - time.time())
+    return payload
+
+async def get_optional_user_id(request: Request) -> Optional[int]:
+    """The caller's id if the request carries a valid token, without rejecting anonymous requests."""
+    scheme, credentials = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if not credentials or scheme.lower() not in ("bearer", "token"):
+        return None
+    try:
+        payload = await get_token_claims(credentials)
+    except HTTPException:
+        # Expired or invalid: treat the caller as anonymous, e.g. on the login that renews it
+        return None
+    if payload is None or payload.get("sub") is None:
+        return None
+    return int(payload["sub"])
+
+def credentials_exception(token: CustomHTTPAuthorizationCredentials) -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": token.scheme.capitalize()},
     )
 
+async def get_current_user_id(token: CustomHTTPAuthorizationCredentials = Depends(security)) -> int:
     # Extract the token from the credentials
     token_str = token.credentials
     
-    # Decode the JWT token
-    payload = decode_access_token(token_str)
-    
-    if payload is None:
-        raise credentials_exception
-    
-    user_id: str = payload.get("sub")
+    # Decode the JWT token, reusing claims already verified for this token
+    payload = await get_token_claims(token_str)
     
-    # Retrieve the user by user_id
-    user = get_user_by_id(db, user_id=int(user_id))
+    if payload is None or payload.get("sub") is None:
+        raise credentials_exception(token)
     
+    return int(payload["sub"])
+
+async def get_current_user(db: AsyncSession = Depends(get_db),
+                           token: CustomHTTPAuthorizationCredentials = Depends(security),
+                           user_id: int = Depends(get_current_user_id)) -> UserRow:
+    """The caller as a read-only row; enough for ownership checks and author fields."""
+    user = await get_cached_user_row_by_id(db, user_id=user_id)
     if user is None:
-        raise credentials_exception
-    
+        raise credentials_exception(token)
     return user
 
 # import logging
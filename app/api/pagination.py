@@ -0,0 +1,27 @@
+import base64
+import json
+from typing import Any, List
+from fastapi import HTTPException, status
+
+# Hard upper bound for any page size requested by a client
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return values
+
+def clamp_limit(limit: int) -> int:
+    return max(0, min(limit, MAX_PAGE_SIZE))
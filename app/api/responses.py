@@ -0,0 +1,29 @@
+from typing import Any, Mapping, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional; pydantic's serializer gives the same bytes, a little slower
+    orjson = None
+
+_any_adapter = TypeAdapter(Any)
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, byte-for-byte what a response_model route would send for the same data.
+
+    Content must already be JSON-shaped (dicts, lists, str, int, bool, None);
+    nothing is validated or converted on the way out.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return _any_adapter.dump_json(content)
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Skip response_model validation for data that came straight from trusted rows.
+
+    Keep response_model on the route for the OpenAPI schema; FastAPI passes a
+    returned Response through untouched, so pass along any headers set on the
+    injected response.
+    """
+    return Response(dumps(content), status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,152 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.crud.article import (count_articles, create_article, get_article_by_slug, get_article_id_by_slug, get_articles,
+                              search_articles)
+from app.crud.feed import fan_out_article, get_feed_articles
+from app.crud.comment import create_comment, delete_comment, get_comment, get_comments_after
+from app.crud.user import UserRow
+from app.schemas.article import ArticleCreateWrapper, ArticleFeedPage, ArticleListResponse, ArticleResponseWrapper
+from app.schemas.comment import CommentCreateWrapper, CommentPage, CommentResponseWrapper
+from app.api.deps import get_db, get_current_user, get_read_db
+from app.api.pagination import clamp_limit, decode_cursor, encode_cursor
+from app.api.conditional import PUBLIC_REVALIDATE, conditional_get
+
+router = APIRouter(prefix="/api/articles", tags=["articles"])
+
+# Article payloads embed author profiles and comment counts
+ARTICLE_TABLES = ("articles", "users", "comments", "tags")
+COMMENT_TABLES = ("articles", "comments", "users")
+
+@router.get("/", response_model=ArticleListResponse)
+async def list_articles(request: Request,
+                        response: Response,
+                        tag: Optional[str] = None,
+                        author: Optional[str] = None,
+                        limit: int = Query(20, ge=0),
+                        offset: int = Query(0, ge=0),
+                        db: AsyncSession = Depends(get_read_db)):
+    if (not_modified := await conditional_get(request, response, db, ARTICLE_TABLES, PUBLIC_REVALIDATE)) is not None:
+        return not_modified
+    articles = await get_articles(db, tag=tag, author=author, skip=offset, limit=clamp_limit(limit))
+    articles_count = await count_articles(db, tag=tag, author=author)
+    return {"articles": articles, "articles_count": articles_count}
+
+@router.post("/", response_model=ArticleResponseWrapper)
+async def publish_article(article: ArticleCreateWrapper,
+                          background_tasks: BackgroundTasks,
+                          db: AsyncSession = Depends(get_db),
+                          current_user: UserRow = Depends(get_current_user)):
+    db_article = await create_article(db, author_id=current_user.id, article=article.article)
+    # Followers' feeds are filled after the response has been sent
+    background_tasks.add_task(fan_out_article, db_article.id, current_user.id)
+    return {"article": {
+        "id": db_article.id,
+        "slug": db_article.slug,
+        "title": db_article.title,
+        "description": db_article.description,
+        "body": db_article.body,
+        "tag_list": db_article.tag_list,
+        "comments_count": 0,
+        "author": current_user,
+    }}
+
+def decode_id_cursor(cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    if len(values) != 1 or not isinstance(values[0], int):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return values[0]
+
+# Registered before /{slug}/ so "feed" is not taken for a slug
+@router.get("/feed/", response_model=ArticleFeedPage)
+async def read_feed(cursor: Optional[str] = None,
+                    limit: int = Query(20, ge=1),
+                    db: AsyncSession = Depends(get_read_db),
+                    current_user: UserRow = Depends(get_current_user)):
+    articles, has_more = await get_feed_articles(db, user_id=current_user.id, limit=clamp_limit(limit),
+                                                 before_id=decode_id_cursor(cursor))
+    next_cursor = encode_cursor([articles[-1].id]) if has_more and articles else None
+    return {"articles": articles, "next_cursor": next_cursor}
+
+# Registered before /{slug}/ so "search" is not taken for a slug
+@router.get("/search/", response_model=ArticleListResponse)
+async def find_articles(request: Request,
+                        response: Response,
+                        q: str = Query(..., min_length=1),
+                        limit: int = Query(20, ge=0),
+                        offset: int = Query(0, ge=0),
+                        db: AsyncSession = Depends(get_read_db)):
+    if (not_modified := await conditional_get(request, response, db, ARTICLE_TABLES, PUBLIC_REVALIDATE)) is not None:
+        return not_modified
+    articles, articles_count = await search_articles(db, terms=q, skip=offset, limit=clamp_limit(limit))
+    return {"articles": articles, "articles_count": articles_count}
+
+@router.get("/{slug}/", response_model=ArticleResponseWrapper)
+async def read_article(slug: str, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    if (not_modified := await conditional_get(request, response, db, ARTICLE_TABLES, PUBLIC_REVALIDATE)) is not None:
+        return not_modified
+    article = await get_article_by_slug(db, slug=slug)
+    if article is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article not found",
+        )
+    return {"article": article}
+
+async def get_article_id_or_404(db: AsyncSession, slug: str) -> int:
+    article_id = await get_article_id_by_slug(db, slug=slug)
+    if article_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article not found",
+        )
+    return article_id
+
+@router.get("/{slug}/comments/", response_model=CommentPage)
+async def list_comments(slug: str,
+                        request: Request,
+                        response: Response,
+                        cursor: Optional[str] = None,
+                        limit: int = Query(20, ge=1),
+                        db: AsyncSession = Depends(get_read_db)):
+    if (not_modified := await conditional_get(request, response, db, COMMENT_TABLES, PUBLIC_REVALIDATE)) is not None:
+        return not_modified
+    article_id = await get_article_id_or_404(db, slug)
+    after_id = decode_id_cursor(cursor)
+    comments, has_more = await get_comments_after(db, article_id=article_id, limit=clamp_limit(limit), after_id=after_id)
+    next_cursor = encode_cursor([comments[-1].id]) if has_more and comments else None
+    return {"comments": comments, "next_cursor": next_cursor}
+
+@router.post("/{slug}/comments/", response_model=CommentResponseWrapper)
+async def add_comment(slug: str,
+                      comment: CommentCreateWrapper,
+                      db: AsyncSession = Depends(get_db),
+                      current_user: UserRow = Depends(get_current_user)):
+    article_id = await get_article_id_or_404(db, slug)
+    db_comment = await create_comment(db, article_id=article_id, author_id=current_user.id, comment=comment.comment)
+    return {"comment": {"id": db_comment.id, "body": db_comment.body, "author": current_user}}
+
+@router.delete("/{slug}/comments/{comment_id}/", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_comment(slug: str,
+                         comment_id: int,
+                         db: AsyncSession = Depends(get_db),
+                         current_user: UserRow = Depends(get_current_user)):
+    article_id = await get_article_id_or_404(db, slug)
+    db_comment = await get_comment(db, article_id=article_id, comment_id=comment_id)
+    if db_comment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comment not found",
+        )
+    if db_comment.author_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only delete your own comments",
+        )
+    await delete_comment(db, db_comment)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.crud.feed import backfill_feeds
+from app.crud.profile import follow_user, is_following, unfollow_user
+from app.crud.user import UserRow, get_user_by_username
+from app.schemas.user import ProfileResponseWrapper
+from app.api.deps import get_current_user, get_db, get_optional_user_id, get_read_db
+from app.api.conditional import PRIVATE_REVALIDATE, conditional_get
+
+router = APIRouter(prefix="/api/profiles", tags=["profiles"])
+
+PROFILE_TABLES = ("users", "follows")
+
+async def get_profile_user_or_404(db: AsyncSession, username: str):
+    user = await get_user_by_username(db, username=username)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return user
+
+def profile_response(user, following: bool) -> dict:
+    return {"profile": {"username": user.username, "bio": user.bio, "image": user.image, "following": following}}
+
+@router.get("/{username}/", response_model=ProfileResponseWrapper)
+async def read_profile(username: str, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    viewer_id = await get_optional_user_id(request)
+    # following depends on who asks, so the ETag includes the viewer and shared caches keep out
+    if (not_modified := await conditional_get(request, response, db, PROFILE_TABLES, PRIVATE_REVALIDATE,
+                                              viewer_id)) is not None:
+        return not_modified
+    user = await get_profile_user_or_404(db, username)
+    following = viewer_id is not None and await is_following(db, follower_id=viewer_id, followee_id=user.id)
+    return profile_response(user, following)
+
+@router.post("/{username}/follow/", response_model=ProfileResponseWrapper)
+async def follow_profile(username: str,
+                         background_tasks: BackgroundTasks,
+                         db: AsyncSession = Depends(get_db),
+                         current_user: UserRow = Depends(get_current_user)):
+    followee = await get_profile_user_or_404(db, username)
+    if followee.id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You cannot follow yourself",
+        )
+    if await follow_user(db, follower_id=current_user.id, followee_id=followee.id):
+        # Articles published from now on arrive by fan-out; copy in the latest ones
+        background_tasks.add_task(backfill_feeds, followee.id, current_user.id)
+    return profile_response(followee, True)
+
+@router.delete("/{username}/follow/", response_model=ProfileResponseWrapper)
+async def unfollow_profile(username: str,
+                           background_tasks: BackgroundTasks,
+                           db: AsyncSession = Depends(get_db),
+                           current_user: UserRow = Depends(get_current_user)):
+    followee = await get_profile_user_or_404(db, username)
+    unfollowed = await unfollow_user(db, follower_id=current_user.id, followee_id=followee.id)
+    # followee still holds the count from before the unfollow
+    if unfollowed and followee.followers_count == settings.FEED_FANOUT_MAX_FOLLOWERS:
+        # Back under the threshold, so reads stop merging this author in; fan out their latest instead
+        background_tasks.add_task(backfill_feeds, followee.id)
+    return profile_response(followee, False)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.tag import get_popular_tags
+from app.schemas.article import TagListResponse
+from app.api.deps import get_read_db
+from app.api.pagination import MAX_PAGE_SIZE
+from app.core.config import settings
+
+router = APIRouter(prefix="/api/tags", tags=["tags"])
+
+@router.get("/", response_model=TagListResponse)
+async def list_tags(response: Response,
+                    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+                    db: AsyncSession = Depends(get_read_db)):
+    # No ETag: each worker may serve its cached ranking for up to TAG_CACHE_TTL after a change,
+    # so a version-based validator could pin clients to a stale list. Let them cache as long instead.
+    response.headers["Cache-Control"] = f"public, max-age={settings.TAG_CACHE_TTL}"
+    return {"tags": await get_popular_tags(db, limit=limit)}
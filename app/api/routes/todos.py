@@ -1,16 +1,183 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from app.crud.todo import create_todo_item, get_todo_items
-from app.schemas.todo import TodoCreate,TodoResponse
-from app.api.deps import get_db
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from typing import AsyncIterator, List, Literal, Optional, Tuple, Union
+from app.core.config import settings
+from app.crud.todo import (create_todo_item, create_todo_items, get_todo_rows, get_todo_rows_after, stream_todo_rows,
+                           todo_coalescer, toggle_todo_row, update_todo_row)
+from app.schemas.todo import TodoBulkResponse, TodoCreate, TodoPage, TodoResponse, TodoUpdate
+from app.api.deps import choose_read_engine, get_db, get_read_db, read_session
+from app.api.pagination import clamp_limit, decode_cursor, encode_cursor
+from app.api.conditional import PUBLIC_REVALIDATE, conditional_get
+from app.api.responses import json_response
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
 @router.post("/", response_model=TodoResponse)
-def create_todo(todo: TodoCreate, db: Session = Depends(get_db)):
-    return create_todo_item(db=db, todo=todo)
+async def create_todo(todo: TodoCreate, db: AsyncSession = Depends(get_db)):
+    if settings.TODO_WRITE_COALESCING:
+        # One commit (and fsync) for every create that arrives within the window
+        return json_response(await todo_coalescer.submit(todo))
+    return json_response(await create_todo_item(db=db, todo=todo))
 
-@router.get("/", response_model=List[TodoResponse])
-def read_todos(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return get_todo_items(db=db, skip=skip, limit=limit)
+def todo_or_404(todo: Optional[dict]) -> Response:
+    if todo is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Todo not found",
+        )
+    return json_response(todo)
+
+@router.put("/{todo_id}/", response_model=TodoResponse)
+async def update_todo(todo_id: int, todo: TodoUpdate, db: AsyncSession = Depends(get_db)):
+    return todo_or_404(await update_todo_row(db, todo_id=todo_id, todo=todo))
+
+@router.post("/{todo_id}/toggle/", response_model=TodoResponse)
+async def toggle_todo(todo_id: int, db: AsyncSession = Depends(get_db)):
+    return todo_or_404(await toggle_todo_row(db, todo_id=todo_id))
+
+async def iter_bulk_items(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """Yield (index, raw item) from a JSON array body or a streamed NDJSON body."""
+    if request.headers.get("content-type", "").startswith(("application/x-ndjson", "application/jsonl")):
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if buffer.strip():
+            yield index, buffer
+        return
+
+    try:
+        items = await request.json()
+    except ValueError:
+        items = None
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array or an NDJSON body of todos",
+        )
+    for index, item in enumerate(items):
+        yield index, item
+
+@router.post("/bulk/", response_model=TodoBulkResponse)
+async def create_todos_bulk(request: Request,
+                            batch_size: Optional[int] = Query(None, ge=1, le=10000),
+                            db: AsyncSession = Depends(get_db)):
+    batch_size = batch_size or settings.TODO_BULK_BATCH_SIZE
+    created, errors = [], []
+    batch: List[Tuple[int, TodoCreate]] = []
+
+    async def flush():
+        try:
+            ids = await create_todo_items(db=db, todos=[todo for _, todo in batch])
+        except SQLAlchemyError as exc:
+            await db.rollback()
+            errors.extend({"index": index, "detail": f"Insert failed: {exc.__class__.__name__}"} for index, _ in batch)
+        else:
+            created.extend({"index": index, "id": todo_id} for (index, _), todo_id in zip(batch, ids))
+        batch.clear()
+
+    async for index, raw in iter_bulk_items(request):
+        try:
+            if isinstance(raw, bytes):
+                todo = TodoCreate.model_validate_json(raw)
+            else:
+                todo = TodoCreate.model_validate(raw)
+        except ValidationError as exc:
+            errors.append({"index": index, "detail": exc.errors(include_url=False, include_context=False, include_input=False)})
+            continue
+        batch.append((index, todo))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    return {"created": created, "errors": errors}
+
+EXPORT_COLUMNS = ("id", "title", "description", "completed")
+
+async def iter_export(engine: AsyncEngine, format: str, completed: Optional[bool],
+                      after_id: Optional[int]) -> AsyncIterator[str]:
+    # The response outlives the request's dependencies, so the stream owns its session
+    async with read_session(engine) as db:
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            yield buffer.getvalue()
+        async for rows in stream_todo_rows(db, completed=completed, after_id=after_id):
+            if format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows)
+
+@router.get("/export/")
+async def export_todos(request: Request,
+                       format: Literal["ndjson", "csv"] = "ndjson",
+                       completed: Optional[bool] = None,
+                       after_id: Optional[int] = Query(None, description="Resume after this todo id")):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        iter_export(await choose_read_engine(request), format, completed, after_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="todos.{format}"'},
+    )
+
+CURSOR_VALUE_TYPES = {"id": int, "title": str, "completed": bool}
+
+def _is_cursor_value(value, expected: type) -> bool:
+    # bool is an int subclass, so true/false must not pass for an id
+    return isinstance(value, expected) and (expected is bool or not isinstance(value, bool))
+
+@router.get("/", response_model=Union[TodoPage, List[TodoResponse]])
+async def read_todos(request: Request,
+                     response: Response,
+                     skip: int = 0,
+                     limit: int = Query(10, ge=0),
+                     cursor: Optional[str] = Query(None, description="Pass an empty cursor to start keyset pagination"),
+                     order_by: Literal["id", "title", "completed"] = "id",
+                     db: AsyncSession = Depends(get_read_db)):
+    if (not_modified := await conditional_get(request, response, db, ("todos",), PUBLIC_REVALIDATE)) is not None:
+        return not_modified
+    limit = clamp_limit(limit)
+    # Rows go straight to JSON; response_model only documents the shape
+    if cursor is None:
+        # Legacy offset pagination
+        rows = await get_todo_rows(db=db, skip=skip, limit=limit)
+        return json_response([row._asdict() for row in rows], headers=response.headers)
+
+    after = None
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != 3 or values[0] != order_by:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the requested ordering",
+            )
+        if not (_is_cursor_value(values[1], CURSOR_VALUE_TYPES[order_by]) and _is_cursor_value(values[2], int)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        after = values[1:]
+
+    rows, has_more = await get_todo_rows_after(db=db, limit=limit, order_by=order_by, after=after)
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor([order_by, getattr(last, order_by), last.id])
+    return json_response({"items": [row._asdict() for row in rows], "next_cursor": next_cursor},
+                         headers=response.headers)
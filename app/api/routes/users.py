@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Mapping, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.user import UserCreateWrapper, UserLoginWrapper, UserUpdateWrapper, UserResponseWrapper
-from app.db.models import User
-from app.crud.user import get_user_by_email, get_user_by_username, create_user, update_user
-from app.core.security.jwt import create_access_token, get_password_hash, verify_password
-from ..deps import get_db, get_current_user
+from app.crud.user import UserRow, get_user_by_email, get_user_by_username, get_user_row_by_id, create_user, update_password_hash, update_user
+from app.core.security.jwt import create_access_token
+from app.core.security.hashing import hash_password, check_password_and_update
+from app.core.security.models import CustomHTTPAuthorizationCredentials
+from ..deps import (credentials_exception, get_current_user, get_current_user_id, get_db, get_read_db,
+                    note_write, security)
+from ..conditional import PRIVATE_REVALIDATE, conditional_get
+from ..responses import json_response
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
@@ -12,8 +17,8 @@ router = APIRouter(prefix="/api/users", tags=["users"])
 def create_access_token_for_user(user_id: int) -> str:
     return create_access_token(data={"sub": str(user_id)})
 
-def get_user_or_404(db: Session, email: str):
-    db_user = get_user_by_email(db, email=email)
+async def get_user_or_404(db: AsyncSession, email: str):
+    db_user = await get_user_by_email(db, email=email)
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -21,50 +26,79 @@ def get_user_or_404(db: Session, email: str):
         )
     return db_user
 
-def build_user_response(user) -> dict:
-    return {"user": user}
+def build_user_response(user, token: str, headers: Optional[Mapping[str, str]] = None) -> Response:
+    # Field order of UserResponse. The stored email and image were validated on the way in,
+    # so they go out as-is instead of through a second EmailStr/HttpUrl validation.
+    return json_response({"user": {
+        "username": user.username,
+        "email": user.email,
+        "bio": user.bio,
+        "image": user.image,
+        "id": user.id,
+        "token": token,
+    }}, headers=headers)
 
 @router.post("/", response_model=UserResponseWrapper)
-async def register_user(user: UserCreateWrapper, db: Session = Depends(get_db)):
+async def register_user(user: UserCreateWrapper, db: AsyncSession = Depends(get_db)):
     user_data = user.user
-    if get_user_by_email(db, email=user_data.email):
+    if await get_user_by_email(db, email=user_data.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    user_data.password = get_password_hash(user_data.password)
-    created_user = create_user(db=db, user=user_data)
-    created_user.token = create_access_token_for_user(created_user.id)
+    user_data.password = await hash_password(user_data.password)
+    created_user = await create_user(db=db, user=user_data)
+    # The new token's first requests may beat replication of the new row
+    await note_write(created_user.id)
 
-    return build_user_response(created_user)
+    return build_user_response(created_user, create_access_token_for_user(created_user.id))
+
+@router.get("/", response_model=UserResponseWrapper)
+async def read_current_user(request: Request,
+                            response: Response,
+                            db: AsyncSession = Depends(get_read_db),
+                            token: CustomHTTPAuthorizationCredentials = Depends(security),
+                            user_id: int = Depends(get_current_user_id)):
+    # The body echoes the token, so it is part of the ETag along with the user
+    if (not_modified := await conditional_get(request, response, db, ("users",), PRIVATE_REVALIDATE,
+                                              user_id, token.credentials)) is not None:
+        return not_modified
+    # Not the shared user cache: a replica row read here could be older than the cached one
+    user = await get_user_row_by_id(db, user_id=user_id)
+    if user is None:
+        raise credentials_exception(token)
+    return build_user_response(user, token.credentials, headers=response.headers)
 
 @router.post("/login/", response_model=UserResponseWrapper)
-async def login_user(user: UserLoginWrapper, db: Session = Depends(get_db)):
+async def login_user(user: UserLoginWrapper, db: AsyncSession = Depends(get_db)):
     user_data = user.user
-    db_user = get_user_or_404(db, email=user_data.email)
-    if not verify_password(user_data.password, db_user.password):
+    db_user = await get_user_or_404(db, email=user_data.email)
+    valid, new_hash = await check_password_and_update(user_data.password, db_user.password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password"
         )
-    db_user.token = create_access_token_for_user(db_user.id)
-
-    return build_user_response(db_user)
+    if new_hash is not None:
+        # Stored at another bcrypt cost than BCRYPT_ROUNDS; move it over while we have the password
+        await update_password_hash(db, user_id=db_user.id, password_hash=new_hash)
+    return build_user_response(db_user, create_access_token_for_user(db_user.id))
 
 @router.put("/", response_model=UserResponseWrapper)
 async def update_user_profile(user: UserUpdateWrapper,
-                              db: Session = Depends(get_db),
-                              current_user: User = Depends(get_current_user)):
+                              db: AsyncSession = Depends(get_db),
+                              current_user: UserRow = Depends(get_current_user)):
     user_data = user.user
-    if user_data.username and user_data.username != current_user.username and get_user_by_username(db, username=user_data.username):
+    if user_data.username and user_data.username != current_user.username and await get_user_by_username(db, username=user_data.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already in use."
         )
-    if user_data.email and user_data.email.lower() != current_user.email.lower() and get_user_by_email(db, email=user_data.email):
+    if user_data.email and user_data.email.lower() != current_user.email.lower() and await get_user_by_email(db, email=user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already in use."
         )
-    updated_user = update_user(db, db_user=current_user, user_update=user_data)
-    updated_user.token = create_access_token_for_user(updated_user.id)
+    if user_data.password:
+        user_data.password = await hash_password(user_data.password)
+    updated_user = await update_user(db, user=current_user, user_update=user_data)
 
-    return build_user_response(updated_user)
\ No newline at end of file
+    return build_user_response(updated_user, create_access_token_for_user(updated_user.id))
@@ -0,0 +1,125 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from .config import settings
+from .metrics import labelled_samples, register_collector
+
+
+class LocalCacheBackend:
+    """Bounded in-process LRU store with a per-entry expiry."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    async def clear(self):
+        self._data.clear()
+
+
+class RedisCacheBackend:
+    """Shared store so several workers see the same entries and invalidations."""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("AUTH_CACHE_URL requires the 'redis' package") from exc
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._client.set(key, json.dumps(value), px=max(1, int(ttl * 1000)))
+
+    async def delete(self, key: str):
+        await self._client.delete(key)
+
+    async def clear(self):
+        pass
+
+
+class TTLCache:
+    """Namespaced cache with hit/miss counters on top of a backend.
+
+    Values must be JSON serialisable so any backend can hold them.
+    """
+
+    def __init__(self, name: str, ttl: float, backend):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key) -> str:
+        return f"{self.name}:{key}"
+
+    async def get(self, key) -> Optional[Any]:
+        value = await self.backend.get(self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl > 0:
+            await self.backend.set(self._key(key), value, ttl)
+
+    async def delete(self, key):
+        await self.backend.delete(self._key(key))
+
+    async def clear(self):
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def make_backend(maxsize: int):
+    if settings.AUTH_CACHE_URL:
+        return RedisCacheBackend(settings.AUTH_CACHE_URL)
+    return LocalCacheBackend(maxsize)
+
+
+# Verified JWT claims keyed by token digest; never kept past the token's exp
+token_cache = TTLCache("token", settings.TOKEN_CACHE_TTL, make_backend(settings.TOKEN_CACHE_SIZE))
+# Public fields of users keyed by id; invalidated by update_user
+user_cache = TTLCache("user", settings.USER_CACHE_TTL, make_backend(settings.USER_CACHE_SIZE))
+# User ids whose reads stay on the primary for a while after they wrote. Per worker
+# unless AUTH_CACHE_URL is set, and so is read-your-writes.
+recent_writers = TTLCache("recent_write", settings.READ_YOUR_WRITES_SECONDS, make_backend(settings.USER_CACHE_SIZE))
+
+@register_collector
+def _cache_counters():
+    caches = (token_cache, user_cache, recent_writers)
+    return [
+        *labelled_samples("cache_hits_total", "counter", "Cache lookups that found a value.", "cache",
+                          {cache.name: cache.hits for cache in caches}),
+        *labelled_samples("cache_misses_total", "counter", "Cache lookups that found nothing.", "cache",
+                          {cache.name: cache.misses for cache in caches}),
+    ]
@@ -1,11 +1,75 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Optional explicit async URL (e.g. mysql+asyncmy://...); derived from DATABASE_URL otherwise
+    ASYNC_DATABASE_URL: Optional[str] = None
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Connection pool (ignored for in-memory SQLite). DB_POOL_PRE_PING unset means on for
+    # database servers, off for SQLite files, which cannot drop an idle connection.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    # Seconds before a pooled connection is replaced; keep below the server's idle timeout
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: Optional[bool] = None
+
+    # PRAGMAs applied to every new SQLite connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+
+    # Comma-separated read replica URLs for GET endpoints; empty sends every query to DATABASE_URL
+    DATABASE_REPLICA_URLS: str = ""
+    # Seconds a user's reads stay on the primary after they write. Tracked in the auth cache,
+    # so only per worker unless AUTH_CACHE_URL is set; set it when replicas meet several workers.
+    READ_YOUR_WRITES_SECONDS: float = 5
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 5
+    REPLICA_HEALTH_CHECK_TIMEOUT: float = 2
+
+    # Startup schema step: "check" that Alembic is at head, "create_all" (development only) or "none"
+    DB_STARTUP: str = "check"
+
+    # bcrypt cost for new hashes; stored hashes at any other cost are rehashed on the next login.
+    # Each step doubles the CPU time per hash; `make calibrate-bcrypt` suggests a value.
+    BCRYPT_ROUNDS: int = 12
+
+    # Password hashing executor: "thread" or "process"
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    # Jobs allowed to wait for a free worker before requests are shed with 503
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Auth caches; set AUTH_CACHE_URL (redis://...) to share them between workers
+    AUTH_CACHE_URL: Optional[str] = None
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: int = 300
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: int = 30
+
+    # Seconds a worker may serve its cached popular tags after another worker changed them
+    TAG_CACHE_TTL: int = 60
+
+    # Authors with at least this many followers are not fanned out on publish; their
+    # articles are merged into followers' feeds at read time instead
+    FEED_FANOUT_MAX_FOLLOWERS: int = 1000
+    # Latest articles of an author copied into a feed when it starts following them
+    FEED_BACKFILL_ARTICLES: int = 20
+
+    # Rows per INSERT transaction for POST /todos/bulk
+    TODO_BULK_BATCH_SIZE: int = 1000
+
+    # Group commit for POST /todos/: creates arriving within the window share one transaction
+    TODO_WRITE_COALESCING: bool = False
+    TODO_COALESCE_WINDOW_MS: float = 2
+    TODO_COALESCE_MAX_BATCH: int = 100
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,167 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Latency buckets in seconds, roughly doubling from 1ms to 10s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition format."""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labels, label_values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {total!r}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def clear(self):
+        self._series.clear()
+
+
+def sample(name: str, kind: str, documentation: str, value: float) -> List[str]:
+    """Lines for a single unlabelled counter or gauge read at scrape time."""
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}", f"{name} {_format_value(value)}"]
+
+
+def labelled_samples(name: str, kind: str, documentation: str, label: str, values: Dict[str, float]) -> List[str]:
+    """Lines for a counter or gauge with one label, one series per label value."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for label_value, value in sorted(values.items()):
+        lines.append(f"{name}{_format_labels((label,), (label_value,))} {_format_value(value)}")
+    return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time spent handling a request.", ("method", "route", "status")
+)
+request_queries = Histogram(
+    "http_request_db_queries", "Database statements executed per request.", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+request_db_time = Histogram(
+    "http_request_db_seconds", "Time spent in database statements per request.", ("method", "route")
+)
+pool_checkout_duration = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled database connection."
+)
+write_batch_size = Histogram(
+    "db_write_batch_size", "Requests committed together by a write coalescer.", ("writer",),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+
+# Collectors return exposition lines for values read at scrape time (pool state, hash executor, caches)
+_collectors: List[Callable[[], Iterable[str]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[str]]):
+    _collectors.append(collector)
+    return collector
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for histogram in (request_duration, request_queries, request_db_time, pool_checkout_duration, write_batch_size):
+        lines.extend(histogram.collect())
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """Database work attributed to the request being handled."""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def record_query(duration: float):
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += duration
+
+
+class MetricsMiddleware:
+    """Times each HTTP request and records the queries it ran, labelled by route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request_stats.reset(token)
+            # The router stores the matched route in scope; templates keep label cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            request_duration.observe(elapsed, method, route, str(status_code))
+            request_queries.observe(stats.queries, method, route)
+            request_db_time.observe(stats.db_seconds, method, route)
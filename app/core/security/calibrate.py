@@ -0,0 +1,52 @@
+"""Pick BCRYPT_ROUNDS for a target hash time on this machine.
+
+Run with: python -m app.core.security.calibrate [--target-ms 250] [--min-rounds 10]
+Prints the time per hash for each cost and the highest cost that stays within
+the target. Run it on the hardware that serves logins, not a laptop.
+"""
+import argparse
+import statistics
+import time
+
+# Below this bcrypt is too cheap to slow down offline guessing in any useful way
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def time_hash(rounds: int, samples: int) -> float:
+    from passlib.hash import bcrypt
+
+    handler = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        handler.hash("calibration-password")
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(target_seconds: float, min_rounds: int = MIN_ROUNDS, samples: int = 3) -> int:
+    """Highest cost whose median hash time is within target_seconds, but never below min_rounds."""
+    chosen = min_rounds
+    for rounds in range(min_rounds, MAX_ROUNDS + 1):
+        elapsed = time_hash(rounds, samples)
+        print(f"rounds={rounds:<3} {elapsed * 1000:9.1f} ms")
+        if elapsed > target_seconds:
+            break
+        chosen = rounds
+    return chosen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250, help="Upper bound for one hash")
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    rounds = calibrate(args.target_ms / 1000, args.min_rounds, args.samples)
+    print(f"BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
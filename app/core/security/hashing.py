@@ -0,0 +1,106 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from ..config import settings
+from ..metrics import register_collector, sample
+from .jwt import get_password_hash, verify_and_update_password
+
+
+class HashMetrics:
+    """Counters for the password hashing executor."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds = 0.0
+        self.hash_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_seconds": self.queue_wait_seconds,
+            "hash_seconds": self.hash_seconds,
+        }
+
+
+hash_metrics = HashMetrics()
+
+
+@register_collector
+def _hash_metrics():
+    return [
+        *sample("password_hash_in_flight", "gauge", "Hash jobs running or queued.", hash_metrics.in_flight),
+        *sample("password_hash_completed_total", "counter", "Hash jobs finished.", hash_metrics.completed),
+        *sample("password_hash_rejected_total", "counter", "Hash jobs shed with 503.", hash_metrics.rejected),
+        *sample("password_hash_queue_wait_seconds_total", "counter", "Time hash jobs waited for a worker.",
+                hash_metrics.queue_wait_seconds),
+        *sample("password_hash_seconds_total", "counter", "Time spent in bcrypt.", hash_metrics.hash_seconds),
+    ]
+
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _timed_call(func, submitted_at: float, *args):
+    # Runs inside the worker; wall-clock time so it is comparable across processes
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+async def _run(func, *args):
+    # Everything beyond the workers themselves is queued; refuse once the queue is full
+    if hash_metrics.in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        hash_metrics.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+    hash_metrics.in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        result, queue_wait, hash_time = await loop.run_in_executor(
+            get_executor(), _timed_call, func, time.time(), *args
+        )
+    finally:
+        hash_metrics.in_flight -= 1
+
+    hash_metrics.completed += 1
+    hash_metrics.queue_wait_seconds += queue_wait
+    hash_metrics.hash_seconds += hash_time
+    return result
+
+
+async def hash_password(password: str) -> str:
+    return await _run(get_password_hash, password)
+
+
+async def check_password_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run(verify_and_update_password, plain_password, hashed_password)
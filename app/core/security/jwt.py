@@ -1,17 +1,33 @@
 import jwt
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 from datetime import datetime, timedelta, UTC
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 from ..config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    # passlib and its bcrypt backend load on first use, not at app import
+    from passlib.context import CryptContext
+
+    # min == max, so a hash at any other cost needs an update, whichever way BCRYPT_ROUNDS moved
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+    )
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(valid, new hash); the new hash is None unless the stored one uses another cost."""
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
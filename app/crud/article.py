@@ -0,0 +1,113 @@
+import re
+import uuid
+from typing import Optional
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, joinedload, selectinload
+from app.db.models import Article, Tag, User, article_tags
+from app.schemas.article import ArticleCreate
+
+def _filter_articles(query, tag: Optional[str] = None, author: Optional[str] = None):
+    if tag:
+        query = query.where(Article.id.in_(
+            select(article_tags.c.article_id)
+            .join(Tag, Tag.id == article_tags.c.tag_id)
+            .where(Tag.name == tag)
+        ))
+    if author:
+        query = query.where(Article.author_id == select(User.id).where(User.username == author).scalar_subquery())
+    return query
+
+async def get_articles(db: AsyncSession, tag: Optional[str] = None, author: Optional[str] = None,
+                       skip: int = 0, limit: int = 20):
+    """Newest articles first, without bodies.
+
+    Author is joined and tags come from one extra IN query, so a page costs
+    two statements however many rows it holds.
+    """
+    query = (
+        select(Article)
+        .options(defer(Article.body), joinedload(Article.author), selectinload(Article.tags))
+        .order_by(Article.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await db.execute(_filter_articles(query, tag=tag, author=author))
+    return result.scalars().all()
+
+async def count_articles(db: AsyncSession, tag: Optional[str] = None, author: Optional[str] = None) -> int:
+    query = _filter_articles(select(func.count()).select_from(Article), tag=tag, author=author)
+    return (await db.execute(query)).scalar_one()
+
+async def get_article_by_slug(db: AsyncSession, slug: str):
+    result = await db.execute(
+        select(Article)
+        .options(joinedload(Article.author), selectinload(Article.tags))
+        .where(Article.slug == slug)
+    )
+    return result.scalars().first()
+
+def _search_ranking(dialect: str, terms: str):
+    """(id, rank) of articles matching terms via the backend's full-text index.
+
+    Lower rank is a better match.
+    """
+    if dialect == "sqlite":
+        fts = table("articles_fts", column("rowid"))
+        # Quote every word so user input can't inject FTS5 query syntax
+        query = " ".join(f'"{word}"' for word in re.findall(r"\w+", terms)) or '""'
+        return (
+            select(fts.c.rowid.label("id"),
+                   func.bm25(literal_column("articles_fts"), 10.0, 5.0, 1.0).label("rank"))
+            .select_from(fts)
+            .where(literal_column("articles_fts").op("MATCH")(query))
+        )
+    if dialect == "mysql":
+        score = match(Article.title, Article.description, Article.body, against=terms).in_natural_language_mode()
+        return select(Article.id.label("id"), (-score).label("rank")).where(score > 0)
+    if dialect == "postgresql":
+        vector = literal_column("articles.search_vector")
+        tsquery = func.websearch_to_tsquery("english", terms)
+        return (
+            select(Article.id.label("id"), (-func.ts_rank(vector, tsquery)).label("rank"))
+            .where(vector.op("@@")(tsquery))
+        )
+    raise ValueError(f"Full-text search is not supported on database backend '{dialect}'")
+
+async def search_articles(db: AsyncSession, terms: str, skip: int = 0, limit: int = 20):
+    """Best matches first, without bodies, plus the total number of matches."""
+    dialect = (await db.connection()).dialect.name
+    ranked = _search_ranking(dialect, terms).subquery()
+    result = await db.execute(
+        select(Article)
+        .join(ranked, ranked.c.id == Article.id)
+        .options(defer(Article.body), joinedload(Article.author), selectinload(Article.tags))
+        .order_by(ranked.c.rank, Article.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    total = (await db.execute(select(func.count()).select_from(ranked))).scalar_one()
+    return result.scalars().all(), total
+
+async def get_article_id_by_slug(db: AsyncSession, slug: str) -> Optional[int]:
+    return (await db.execute(select(Article.id).where(Article.slug == slug))).scalar()
+
+def make_slug(title: str) -> str:
+    # Random suffix so two articles with the same title get different slugs
+    base = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")[:200]
+    return f"{base}-{uuid.uuid4().hex[:8]}" if base else uuid.uuid4().hex[:8]
+
+async def create_article(db: AsyncSession, author_id: int, article: ArticleCreate) -> Article:
+    """Insert an article, creating any tags that do not exist yet; flush hooks count their usage."""
+    names = list(dict.fromkeys(article.tag_list or []))
+    tags = []
+    if names:
+        result = await db.execute(select(Tag).where(Tag.name.in_(names)))
+        existing = {tag.name: tag for tag in result.scalars()}
+        tags = [existing.get(name) or Tag(name=name) for name in names]
+    db_article = Article(slug=make_slug(article.title), title=article.title, description=article.description,
+                         body=article.body, author_id=author_id, tags=tags)
+    db.add(db_article)
+    await db.commit()
+    return db_article
@@ -0,0 +1,31 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.db.models import Comment
+from app.schemas.comment import CommentCreate
+
+async def get_comments_after(db: AsyncSession, article_id: int, limit: int = 20, after_id: Optional[int] = None):
+    """Keyset page of an article's comments, oldest first, with their authors."""
+    query = select(Comment).options(joinedload(Comment.author)).where(Comment.article_id == article_id)
+    if after_id is not None:
+        query = query.where(Comment.id > after_id)
+    result = await db.execute(query.order_by(Comment.id).limit(limit + 1))
+    comments = result.scalars().all()
+    return comments[:limit], len(comments) > limit
+
+async def get_comment(db: AsyncSession, article_id: int, comment_id: int):
+    result = await db.execute(
+        select(Comment).where(Comment.id == comment_id, Comment.article_id == article_id)
+    )
+    return result.scalars().first()
+
+async def create_comment(db: AsyncSession, article_id: int, author_id: int, comment: CommentCreate):
+    db_comment = Comment(article_id=article_id, author_id=author_id, **comment.model_dump())
+    db.add(db_comment)
+    await db.commit()
+    return db_comment
+
+async def delete_comment(db: AsyncSession, db_comment: Comment):
+    await db.delete(db_comment)
+    await db.commit()
@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import Optional
+from sqlalchemy import bindparam, exists, insert, literal, select, true, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, joinedload, selectinload
+from app.core.config import settings
+from app.db.models import Article, User, feed_entries, follows
+from app.db.session import AsyncSessionLocal
+
+# Fan-out on write fills feed_entries for authors below FEED_FANOUT_MAX_FOLLOWERS.
+# Articles by authors at or above it are merged in when a feed is read, so one
+# publish never writes more than FEED_FANOUT_MAX_FOLLOWERS rows.
+
+def _not_in_feed(user_id, article_id):
+    return ~exists().where(feed_entries.c.user_id == user_id, feed_entries.c.article_id == article_id)
+
+async def _fans_out(db: AsyncSession, author_id: int) -> bool:
+    followers = (await db.execute(select(User.followers_count).where(User.id == author_id))).scalar()
+    return bool(followers) and followers < settings.FEED_FANOUT_MAX_FOLLOWERS
+
+async def fan_out_article(article_id: int, author_id: int):
+    """Add a newly published article to its author's followers' feeds.
+
+    Runs as a background task after the publish response, so it has its own session.
+    """
+    async with AsyncSessionLocal() as db:
+        if not await _fans_out(db, author_id):
+            return
+        rows = select(follows.c.follower_id, literal(article_id)).where(
+            follows.c.followee_id == author_id,
+            # A follow's backfill may have got there first
+            _not_in_feed(follows.c.follower_id, article_id),
+        )
+        await db.execute(insert(feed_entries).from_select(["user_id", "article_id"], rows))
+        await db.commit()
+
+async def backfill_feeds(author_id: int, follower_id: Optional[int] = None):
+    """Copy the author's latest FEED_BACKFILL_ARTICLES into one follower's feed, or every follower's."""
+    async with AsyncSessionLocal() as db:
+        if not await _fans_out(db, author_id):
+            return
+        recent = (
+            select(Article.id)
+            .where(Article.author_id == author_id)
+            .order_by(Article.id.desc())
+            .limit(settings.FEED_BACKFILL_ARTICLES)
+            .subquery()
+        )
+        if follower_id is None:
+            readers = select(follows.c.follower_id.label("user_id")).where(follows.c.followee_id == author_id)
+        else:
+            readers = select(literal(follower_id).label("user_id"))
+        readers = readers.subquery()
+        rows = (
+            select(readers.c.user_id, recent.c.id)
+            .select_from(readers.join(recent, true()))
+            .where(_not_in_feed(readers.c.user_id, recent.c.id))
+        )
+        await db.execute(insert(feed_entries).from_select(["user_id", "article_id"], rows))
+        await db.commit()
+
+@lru_cache(maxsize=None)
+def feed_page_ids(paged: bool):
+    """Ids of up to :page_size feed articles for :user_id, older than :before_id if paged, unordered.
+
+    Fanned-out articles come from one range scan of the feed_entries primary key;
+    articles by followed authors with :fanout_max followers or more are merged in.
+    Built once per shape with bound parameters (see feed_params): constructing the
+    union costs several times what SQLite takes to run it.
+    """
+    user_id = bindparam("user_id")
+    timeline = select(feed_entries.c.article_id).where(feed_entries.c.user_id == user_id)
+    # Walks the (few) authors above the threshold rather than everyone the user follows
+    celebrities = select(User.id).where(
+        User.followers_count >= bindparam("fanout_max"),
+        exists().where(follows.c.follower_id == user_id, follows.c.followee_id == User.id),
+    )
+    pulled = select(Article.id).where(Article.author_id.in_(celebrities))
+    if paged:
+        timeline = timeline.where(feed_entries.c.article_id < bindparam("before_id"))
+        pulled = pulled.where(Article.id < bindparam("before_id"))
+
+    # The newest page_size of the union are among the newest page_size of each side
+    page_size = bindparam("page_size")
+    timeline = timeline.order_by(feed_entries.c.article_id.desc()).limit(page_size).subquery()
+    pulled = pulled.order_by(Article.id.desc()).limit(page_size).subquery()
+    return union(select(timeline.c.article_id), select(pulled.c.id))
+
+def feed_params(user_id: int, limit: int, before_id: Optional[int] = None) -> dict:
+    # One extra row tells whether there is a next page
+    params = {"user_id": user_id, "page_size": limit + 1, "fanout_max": settings.FEED_FANOUT_MAX_FOLLOWERS}
+    if before_id is not None:
+        params["before_id"] = before_id
+    return params
+
+@lru_cache(maxsize=None)
+def _feed_page(paged: bool):
+    return (
+        select(Article)
+        .options(defer(Article.body), joinedload(Article.author), selectinload(Article.tags))
+        .where(Article.id.in_(feed_page_ids(paged)))
+        .order_by(Article.id.desc())
+        .limit(bindparam("page_size"))
+    )
+
+async def get_feed_articles(db: AsyncSession, user_id: int, limit: int = 20, before_id: Optional[int] = None):
+    """Keyset page of the user's home feed, newest first, without bodies."""
+    result = await db.execute(_feed_page(before_id is not None), feed_params(user_id, limit, before_id))
+    articles = result.scalars().all()
+    return articles[:limit], len(articles) > limit
@@ -0,0 +1,62 @@
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import Article, User, feed_entries, follows, note_changed_tables
+
+async def is_following(db: AsyncSession, follower_id: int, followee_id: int) -> bool:
+    result = await db.execute(
+        select(follows.c.follower_id).where(follows.c.follower_id == follower_id, follows.c.followee_id == followee_id)
+    )
+    return result.first() is not None
+
+def _adjust_followers_count(followee_id: int, delta: int):
+    return (
+        update(User)
+        .where(User.id == followee_id)
+        .values(followers_count=User.followers_count + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+def _insert_follow_ignoring_duplicates(dialect: str, follower_id: int, followee_id: int):
+    values = {"follower_id": follower_id, "followee_id": followee_id}
+    if dialect == "postgresql":
+        return postgresql.insert(follows).values(**values).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(follows).values(**values).on_conflict_do_nothing()
+    if dialect == "mysql":
+        return insert(follows).values(**values).prefix_with("IGNORE")
+    raise ValueError(f"No conflict-ignoring insert for database backend '{dialect}'")
+
+async def follow_user(db: AsyncSession, follower_id: int, followee_id: int) -> bool:
+    """Record the follow; False if it already existed.
+
+    The insert skips an existing pair instead of failing, so racing follows by the same
+    pair are settled by the primary key, and only the one that inserted counts.
+    """
+    dialect = (await db.connection()).dialect.name
+    result = await db.execute(_insert_follow_ignoring_duplicates(dialect, follower_id, followee_id))
+    if result.rowcount != 1:
+        return False
+    await db.execute(_adjust_followers_count(followee_id, 1))
+    # followers_count is in no response, so only the follows version moves
+    note_changed_tables(db, {"follows"})
+    await db.commit()
+    return True
+
+async def unfollow_user(db: AsyncSession, follower_id: int, followee_id: int) -> bool:
+    """Remove the follow and the followee's articles from the follower's feed; False if there was none."""
+    result = await db.execute(
+        delete(follows).where(follows.c.follower_id == follower_id, follows.c.followee_id == followee_id)
+    )
+    if not result.rowcount:
+        return False
+    await db.execute(_adjust_followers_count(followee_id, -1))
+    note_changed_tables(db, {"follows"})
+    await db.execute(
+        delete(feed_entries).where(
+            feed_entries.c.user_id == follower_id,
+            feed_entries.c.article_id.in_(select(Article.id).where(Article.author_id == followee_id)),
+        )
+    )
+    await db.commit()
+    return True
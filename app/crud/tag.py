@@ -0,0 +1,40 @@
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import LocalCacheBackend, TTLCache
+from app.core.config import settings
+from app.db.models import Tag
+
+# Popular tag names keyed by (generation, limit); always in-process. Bumping the
+# generation on commit invalidates every cached list at once.
+tag_cache = TTLCache("tags", settings.TAG_CACHE_TTL, LocalCacheBackend(maxsize=16))
+_generation = 0
+
+async def get_popular_tags(db: AsyncSession, limit: int = 20):
+    """Tag names by usage, served from cache or one index-ordered LIMIT query."""
+    key = f"{_generation}:{limit}"
+    names = await tag_cache.get(key)
+    if names is None:
+        result = await db.execute(
+            select(Tag.name)
+            .where(Tag.usage_count > 0)
+            .order_by(Tag.usage_count.desc(), Tag.id.desc())
+            .limit(limit)
+        )
+        names = list(result.scalars().all())
+        await tag_cache.set(key, names)
+    return names
+
+def invalidate_tag_cache():
+    global _generation
+    _generation += 1
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("tag_usage_changed", False):
+        invalidate_tag_cache()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session):
+    session.info.pop("tag_usage_changed", None)
+    session.info.pop("tag_usage_deltas", None)
@@ -1,13 +1,144 @@
-from sqlalchemy.orm import Session
-from app.db.models import TodoItem
-from app.schemas.todo import TodoCreate
-
-def create_todo_item(db: Session, todo: TodoCreate):
-    db_todo = TodoItem(**todo.model_dump())
-    db.add(db_todo)
-    db.commit()
-    db.refresh(db_todo)
-    return db_todo
-
-def get_todo_items(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(TodoItem).offset(skip).limit(limit).all()
\ No newline at end of file
+from typing import AsyncIterator, List, Optional, Sequence
+from sqlalchemy import Row, bindparam, insert, not_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.coalescer import WriteCoalescer
+from app.db.models import TodoItem, note_changed_tables
+from app.db.session import AsyncSessionLocal
+from app.schemas.todo import TodoCreate, TodoUpdate
+
+# Columns a todo page can be ordered by; id is always the tiebreaker
+TODO_SORT_COLUMNS = {
+    "id": TodoItem.id,
+    "title": TodoItem.title,
+    "completed": TodoItem.completed,
+}
+
+# Same order as TodoResponse's fields, so row dicts serialise to the same JSON as the model
+TODO_RESPONSE_COLUMNS = (TodoItem.title, TodoItem.description, TodoItem.id, TodoItem.completed)
+
+async def create_todo_item(db: AsyncSession, todo: TodoCreate) -> dict:
+    """The new todo as a TodoResponse-ordered dict, from INSERT ... RETURNING where supported."""
+    [created] = await create_todo_rows(db, [todo])
+    return created
+
+async def _insert_todos(db: AsyncSession, todos: List[TodoCreate], columns) -> List[tuple]:
+    """Insert a batch of todos in one transaction; `columns` of each new row, in input order."""
+    rows = [{"completed": False, **todo.model_dump()} for todo in todos]
+    connection = await db.connection()
+    if connection.dialect.insert_executemany_returning:
+        # Multi-row INSERT ... RETURNING. Autoincrement ids are handed out in VALUES
+        # order within a statement, so sorting them restores input order without
+        # forcing SQLite into row-at-a-time sort_by_parameter_order mode.
+        result = await db.execute(insert(TodoItem).returning(*columns), rows)
+        inserted = sorted(result.all(), key=lambda row: row.id)
+        note_changed_tables(db, {"todos"})
+    else:
+        # No RETURNING (e.g. MySQL): let the unit of work batch and collect lastrowids
+        db_todos = [TodoItem(**row) for row in rows]
+        db.add_all(db_todos)
+        await db.flush()
+        inserted = [tuple(getattr(db_todo, column.key) for column in columns) for db_todo in db_todos]
+    await db.commit()
+    return inserted
+
+async def create_todo_items(db: AsyncSession, todos: List[TodoCreate]) -> List[int]:
+    """Insert a batch of todos in one transaction and return their ids in input order."""
+    return [row[0] for row in await _insert_todos(db, todos, (TodoItem.id,))]
+
+async def create_todo_rows(db: AsyncSession, todos: List[TodoCreate]) -> List[dict]:
+    """Like create_todo_items, but each new todo as a TodoResponse-ordered dict; no refresh SELECT."""
+    keys = [column.key for column in TODO_RESPONSE_COLUMNS]
+    return [dict(zip(keys, row)) for row in await _insert_todos(db, todos, TODO_RESPONSE_COLUMNS)]
+
+async def _update_todo_row(db: AsyncSession, todo_id: int, values: dict) -> Optional[dict]:
+    """One UPDATE without loading the todo first; the new row, or None if there is no such todo."""
+    statement = (
+        update(TodoItem)
+        .where(TodoItem.id == todo_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    connection = await db.connection()
+    if connection.dialect.update_returning:
+        row = (await db.execute(statement.returning(*TODO_RESPONSE_COLUMNS))).first()
+    else:
+        # No RETURNING (e.g. MySQL): read the row back in the same transaction
+        result = await db.execute(statement)
+        row = None
+        if result.rowcount:
+            row = (await db.execute(select(*TODO_RESPONSE_COLUMNS).where(TodoItem.id == todo_id))).first()
+    if row is None:
+        return None
+    note_changed_tables(db, {"todos"})
+    await db.commit()
+    return row._asdict()
+
+async def update_todo_row(db: AsyncSession, todo_id: int, todo: TodoUpdate) -> Optional[dict]:
+    return await _update_todo_row(db, todo_id, todo.model_dump())
+
+async def toggle_todo_row(db: AsyncSession, todo_id: int) -> Optional[dict]:
+    # Flipped in SQL, so two concurrent toggles cannot both write the same value
+    return await _update_todo_row(db, todo_id, {"completed": not_(TodoItem.completed)})
+
+async def commit_todo_batch(todos: List[TodoCreate]) -> List[dict]:
+    # Runs outside any one request, so the batch has its own session
+    async with AsyncSessionLocal() as db:
+        return await create_todo_rows(db, todos)
+
+# Used by POST /todos/ when TODO_WRITE_COALESCING is on
+todo_coalescer = WriteCoalescer(
+    "todos",
+    commit_todo_batch,
+    window=settings.TODO_COALESCE_WINDOW_MS / 1000,
+    max_batch=settings.TODO_COALESCE_MAX_BATCH,
+)
+
+def _todo_keyset_query(limit: int, order_by: str, after, *entities):
+    """Keyset page: rows strictly after the (value, id) pair of the previous page.
+
+    Selects one extra row to tell whether another page exists.
+    """
+    column = TODO_SORT_COLUMNS[order_by]
+    query = select(*entities)
+    if after is not None:
+        last_value, last_id = after
+        if order_by == "id":
+            query = query.where(TodoItem.id > last_id)
+        else:
+            # Leading >= gives the planner a range seek on the sort column's index;
+            # bind explicitly since booleans can't be compared with > as literals
+            value = bindparam(None, last_value, type_=column.type)
+            query = query.where(column >= value, or_(column > value, TodoItem.id > last_id))
+    if order_by == "id":
+        query = query.order_by(TodoItem.id)
+    else:
+        query = query.order_by(column, TodoItem.id)
+    return query.limit(limit + 1)
+
+async def get_todo_rows(db: AsyncSession, skip: int = 0, limit: int = 10) -> Sequence[Row]:
+    """Offset page of plain (title, description, id, completed) rows; no ORM objects."""
+    result = await db.execute(select(*TODO_RESPONSE_COLUMNS).offset(skip).limit(limit))
+    return result.all()
+
+async def get_todo_rows_after(db: AsyncSession, limit: int = 10, order_by: str = "id", after=None):
+    result = await db.execute(_todo_keyset_query(limit, order_by, after, *TODO_RESPONSE_COLUMNS))
+    rows = result.all()
+    return rows[:limit], len(rows) > limit
+
+async def stream_todo_rows(db: AsyncSession, completed: Optional[bool] = None, after_id: Optional[int] = None,
+                           batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+    """Yield batches of (id, title, description, completed) rows ordered by id.
+
+    Uses a server-side cursor so memory stays bounded by batch_size.
+    """
+    query = select(TodoItem.id, TodoItem.title, TodoItem.description, TodoItem.completed)
+    if completed is not None:
+        query = query.where(TodoItem.completed == completed)
+    if after_id is not None:
+        query = query.where(TodoItem.id > after_id)
+    query = query.order_by(TodoItem.id).execution_options(yield_per=batch_size)
+
+    result = await db.stream(query)
+    async for partition in result.partitions():
+        yield partition
@@ -1,31 +1,85 @@
-from sqlalchemy import func
-from sqlalchemy.orm import Session
-from app.db.models import User
+from typing import NamedTuple, Optional
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import user_cache
+from app.db.models import User, note_changed_tables
 from app.schemas.user import UserCreate, UserUpdate
 
-def get_user_by_id(db: Session, user_id: int):
-    return db.query(User).filter(User.id == user_id).first()
+class UserRow(NamedTuple):
+    """Read-only user for code that only needs to know who is calling."""
+    id: int
+    username: str
+    email: str
+    bio: Optional[str]
+    image: Optional[str]
 
-def get_user_by_username(db: Session, username: str):
-    # return db.query(User).filter(User.username == username).first()
-    # case-sensitive
-    return db.query(User).filter(func.binary(User.username) == username).first()
+USER_ROW_COLUMNS = tuple(getattr(User, field) for field in UserRow._fields)
 
-def get_user_by_email(db: Session, email: str):
-    return db.query(User).filter(User.email.ilike(email)).first()
+async def get_user_row_by_id(db: AsyncSession, user_id: int) -> Optional[UserRow]:
+    """Core SELECT of the public columns; no ORM instance or identity map entry."""
+    result = await db.execute(select(*USER_ROW_COLUMNS).where(User.id == user_id))
+    row = result.first()
+    return None if row is None else UserRow(*row)
 
-def create_user(db: Session, user: UserCreate):
-    db_user = User(**user.model_dump())
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+async def get_cached_user_row_by_id(db: AsyncSession, user_id: int) -> Optional[UserRow]:
+    # Only the public fields are cached; the password hash never leaves the database
+    row = await user_cache.get(user_id)
+    if row is None:
+        found = await get_user_row_by_id(db, user_id)
+        if found is None:
+            return None
+        await user_cache.set(user_id, found._asdict())
+        return found
+    # Picks the fields out, so entries cached with every column by older code still read
+    return UserRow(*(row[field] for field in UserRow._fields))
 
-    return db_user
+async def get_user_by_username(db: AsyncSession, username: str):
+    # Plain equality seeks ix_users_username on every backend. The re-check keeps
+    # the match case-sensitive under MySQL's case-insensitive collations.
+    result = await db.execute(select(User).filter(User.username == username).limit(1))
+    user = result.scalars().first()
+    return user if user is not None and user.username == username else None
 
-def update_user(db:Session, db_user: User, user_update: UserUpdate) -> User:
-    update_data = user_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
\ No newline at end of file
+async def get_user_by_email(db: AsyncSession, email: str):
+    # case-insensitive, served by the lower(email) functional index
+    result = await db.execute(select(User).filter(func.lower(User.email) == email.lower()).limit(1))
+    return result.scalars().first()
+
+async def create_user(db: AsyncSession, user: UserCreate) -> UserRow:
+    # mode="json" stores the validated URL/email strings rather than pydantic objects
+    values = user.model_dump(mode="json")
+    connection = await db.connection()
+    if connection.dialect.insert_returning:
+        result = await db.execute(insert(User).values(**values).returning(*USER_ROW_COLUMNS))
+        created = UserRow(*result.one())
+        note_changed_tables(db, {"users"})
+    else:
+        # No RETURNING (e.g. MySQL): the flush collects the id and nothing is reloaded
+        db_user = User(**values)
+        db.add(db_user)
+        await db.flush()
+        created = UserRow(*(getattr(db_user, field) for field in UserRow._fields))
+    await db.commit()
+    return created
+
+async def update_user(db: AsyncSession, user: UserRow, user_update: UserUpdate) -> UserRow:
+    """Apply the set fields with a single UPDATE and return the user as now stored."""
+    values = user_update.model_dump(exclude_unset=True, mode="json")
+    if not values:
+        return user
+    statement = update(User).where(User.id == user.id).values(**values).execution_options(synchronize_session=False)
+    connection = await db.connection()
+    if connection.dialect.update_returning:
+        updated = UserRow(*(await db.execute(statement.returning(*USER_ROW_COLUMNS))).one())
+    else:
+        await db.execute(statement)
+        updated = user._replace(**{key: value for key, value in values.items() if key in UserRow._fields})
+    note_changed_tables(db, {"users"})
+    await db.commit()
+    await user_cache.delete(user.id)
+    return updated
+
+async def update_password_hash(db: AsyncSession, user_id: int, password_hash: str):
+    # Nothing public changed, so no table version bump, and the user cache never holds the hash
+    await db.execute(update(User).where(User.id == user_id).values(password=password_hash))
+    await db.commit()
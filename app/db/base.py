@@ -1,7 +1,91 @@
-from app.db.session import Base, engine
+import ast
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+from sqlalchemy import inspect, text
+from app.db.session import Base, async_engine, engine
 from app.db.models import User
+from app.db import search  # noqa: F401  registers full-text DDL for create_all
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+VERSIONS_DIR = ALEMBIC_INI.parent / "alembic" / "versions"
+logger = logging.getLogger(__name__)
+_REVISION_LINE = re.compile(r"^(revision|down_revision)\b[^=\n]*=\s*(.+)$", re.MULTILINE)
 
 # Optional: Function to initialize the database
 def init_db():
     """Initialize the database by creating all tables."""
     Base.metadata.create_all(bind=engine)
+
+def alembic_config():
+    # For tests and tooling; the app itself never imports Alembic
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return config
+
+def migration_graph() -> dict:
+    """Parent revisions of each revision under alembic/versions.
+
+    Reads the revision identifiers from the files rather than importing Alembic,
+    which would add a few hundred milliseconds to every worker's startup.
+    """
+    graph = {}
+    for path in VERSIONS_DIR.glob("*.py"):
+        fields = {name: ast.literal_eval(value.strip()) for name, value in _REVISION_LINE.findall(path.read_text())}
+        down = fields.get("down_revision")
+        graph[fields["revision"]] = set(down if isinstance(down, (tuple, list)) else [down] if down else [])
+    return graph
+
+def migration_heads(graph: Optional[dict] = None) -> set:
+    """Head revisions under alembic/versions."""
+    graph = migration_graph() if graph is None else graph
+    return set(graph) - set().union(*graph.values())
+
+def _with_ancestors(graph: dict, revisions: set) -> set:
+    seen, pending = set(), list(revisions)
+    while pending:
+        revision = pending.pop()
+        if revision not in seen:
+            seen.add(revision)
+            pending.extend(graph.get(revision, ()))
+    return seen
+
+def _current_revisions(connection) -> set:
+    if not inspect(connection).has_table("alembic_version"):
+        return set()
+    return set(connection.execute(text("SELECT version_num FROM alembic_version")).scalars())
+
+async def check_schema_at_head():
+    """Fail unless the database has every migration this release knows about.
+
+    A database migrated further by a newer release, as in a rolling deploy, is at a
+    revision whose file this release does not have; it is logged and accepted.
+    """
+    graph = migration_graph()
+    heads = migration_heads(graph)
+    async with async_engine.connect() as conn:
+        current = await conn.run_sync(_current_revisions)
+    unknown = current - set(graph)
+    if unknown:
+        logger.warning("Database schema is at %s, which this release does not know; assuming a newer "
+                       "release migrated it", ", ".join(sorted(unknown)))
+        return
+    if not heads <= _with_ancestors(graph, current):
+        raise RuntimeError(
+            f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+            f"expected {', '.join(sorted(heads))}. Run 'alembic upgrade head', "
+            "or set DB_STARTUP=create_all for a throwaway development database."
+        )
+
+async def prepare_database(mode: str):
+    """Run at startup: "check" the Alembic revision, "create_all" tables (dev only), or "none"."""
+    if mode == "check":
+        await check_schema_at_head()
+    elif mode == "create_all":
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    elif mode != "none":
+        raise ValueError(f"Unknown DB_STARTUP mode '{mode}'")
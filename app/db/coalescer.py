@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+from app.core.metrics import write_batch_size
+
+logger = logging.getLogger(__name__)
+
+class WriteCoalescer:
+    """Group commit: writes arriving within `window` seconds share one transaction.
+
+    `commit_batch` takes a list of items, writes them in a single transaction and
+    returns one result per item, in order. A batch is committed once the window
+    after its first item has passed or it holds `max_batch` items, whichever comes
+    first. If the batch fails as a whole, each item is retried in a transaction of
+    its own so only the offending request sees an error.
+    """
+
+    def __init__(self, name: str, commit_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 window: float, max_batch: int):
+        self.name = name
+        self.commit_batch = commit_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._flush(batch))
+            # Keep a reference; the loop only holds tasks weakly
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: List[Tuple[Any, asyncio.Future]]):
+        write_batch_size.observe(len(batch), self.name)
+        try:
+            await self._commit(batch)
+        finally:
+            # Only reached with futures still pending if the flush itself was cancelled
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    async def _commit(self, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await self.commit_batch([item for item, _ in batch])
+        except Exception as exc:
+            if len(batch) == 1:
+                _resolve(batch[0][1], exception=exc)
+                return
+            logger.warning("%s batch of %d failed (%r); retrying one by one", self.name, len(batch), exc)
+            for item, future in batch:
+                try:
+                    [result] = await self.commit_batch([item])
+                except Exception as item_exc:
+                    _resolve(future, exception=item_exc)
+                else:
+                    _resolve(future, result)
+            return
+        for (_, future), result in zip(batch, results):
+            _resolve(future, result)
+
+def _resolve(future: asyncio.Future, result: Any = None, exception: Optional[BaseException] = None):
+    # The request may have been cancelled while it waited
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
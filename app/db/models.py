@@ -1,6 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Table
-from sqlalchemy.orm import relationship
-from .session import Base
+from collections import Counter
+from itertools import chain
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Index, Table, event, func, select, update
+from sqlalchemy.orm import Session, attributes, relationship
+from sqlalchemy.ext.asyncio import AsyncSession
+from .session import Base, run_after_commit
 
 class TodoItem(Base):
     __tablename__ = "todos"
@@ -10,6 +13,11 @@ class TodoItem(Base):
     description = Column(Text)
     completed = Column(Boolean, default=False)
 
+    __table_args__ = (
+        # Keyset pagination ordered by completed with id as the tiebreaker
+        Index("ix_todos_completed_id", "completed", "id"),
+    )
+
 class User(Base):
     __tablename__ = "users"
 
@@ -27,10 +35,19 @@ class User(Base):
     password = Column(String(255), nullable=False)
     bio = Column(Text, nullable=True)
     image = Column(String(255), nullable=True)
+    # Maintained by follow/unfollow; decides between feed fan-out on write and on read
+    followers_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     articles = relationship("Article", back_populates="author")
     comments = relationship("Comment", back_populates="author")
 
+    __table_args__ = (
+        # Case-insensitive email lookups seek this instead of scanning
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+        # Feed reads find the few authors above the fan-out threshold with a range seek
+        Index("ix_users_followers_count", "followers_count"),
+    )
+
 class Article(Base):
     __tablename__ = "articles"
 
@@ -40,11 +57,22 @@ class Article(Base):
     description = Column(Text)
     body = Column(Text)
     author_id = Column(Integer, ForeignKey("users.id"))
+    # Maintained by the flush hooks below so list views need no COUNT(*)
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     author = relationship("User", back_populates="articles")
     comments = relationship("Comment", back_populates="article")
     tags = relationship("Tag", secondary="article_tags", back_populates="articles")
 
+    __table_args__ = (
+        # Author pages: author_id lookups in id order
+        Index("ix_articles_author_id_id", "author_id", "id"),
+    )
+
+    @property
+    def tag_list(self):
+        return [tag.name for tag in self.tags]
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -56,17 +84,162 @@ class Comment(Base):
     author = relationship("User", back_populates="comments")
     article = relationship("Article", back_populates="comments")
 
+    __table_args__ = (
+        # Keyset pagination of an article's comments
+        Index("ix_comments_article_id_id", "article_id", "id"),
+        Index("ix_comments_author_id", "author_id"),
+    )
+
 
 class Tag(Base):
     __tablename__ = "tags"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, index=True)
+    # Number of articles carrying this tag; maintained by the flush hooks below
+    usage_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     articles = relationship("Article", secondary="article_tags", back_populates="tags")
 
+    __table_args__ = (
+        Index("ix_tags_usage_count", "usage_count"),
+    )
+
 article_tags = Table(
     'article_tags', Base.metadata,
-    Column('article_id', Integer, ForeignKey('articles.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    # Composite primary key: one link per (article, tag); also serves article_id lookups
+    Column('article_id', Integer, ForeignKey('articles.id'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
+    # Tag filters go from tag_id to article_id
+    Index('ix_article_tags_tag_id_article_id', 'tag_id', 'article_id'),
+    )
+
+
+follows = Table(
+    'follows', Base.metadata,
+    # Primary key order serves "who does this user follow"
+    Column('follower_id', Integer, ForeignKey('users.id'), primary_key=True),
+    Column('followee_id', Integer, ForeignKey('users.id'), primary_key=True),
+    # Fan-out reads an author's followers
+    Index('ix_follows_followee_id_follower_id', 'followee_id', 'follower_id'),
+    )
+
+feed_entries = Table(
+    'feed_entries', Base.metadata,
+    # Precomputed home feed. The primary key makes a feed page one range scan of
+    # (user_id, article_id) in descending article id order.
+    Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+    Column('article_id', Integer, ForeignKey('articles.id'), primary_key=True),
+    )
+
+
+class TableVersion(Base):
+    """Change counter per table, read to build ETags for conditional GETs."""
+    __tablename__ = "table_versions"
+
+    name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+VERSIONED_TABLES = ("todos", "users", "articles", "comments", "tags", "follows")
+
+@event.listens_for(TableVersion.__table__, "after_create")
+def _seed_table_versions(target, connection, **kw):
+    connection.execute(target.insert(), [{"name": name, "version": 0} for name in VERSIONED_TABLES])
+
+def bump_table_versions(names):
+    """UPDATE that advances the version of each named table."""
+    versions = TableVersion.__table__
+    return (
+        update(versions)
+        .where(versions.c.name.in_(sorted(names)))
+        .values(version=versions.c.version + 1)
     )
+
+def note_changed_tables(session, names):
+    """Bump the versions of the named tables once the session commits.
+
+    The bump runs after the commit, in its own transaction, so concurrent writers of
+    a table never queue on its table_versions row for the length of their transactions.
+    A reader between the two commits sees new rows under the old version, which only
+    costs it a 200 on its next conditional GET.
+    """
+    names = set(names).intersection(VERSIONED_TABLES)
+    if not names:
+        return
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    sync_session.info.setdefault("changed_tables", set()).update(names)
+    run_after_commit(sync_session, "table_versions", _bump_changed_tables)
+
+def _bump_changed_tables(session):
+    # Kept across rollbacks (savepoints roll back too); an extra bump only costs a 200
+    session.execute(bump_table_versions(session.info.pop("changed_tables")))
+
+
+# Tag usage and article comment counters are adjusted in the same flush (and so the
+# same transaction) that writes the rows they count.
+
+@event.listens_for(Session, "before_flush")
+def _collect_deleted_article_tags(session, flush_context, instances):
+    # Links of deleted articles must be read before the flush removes them
+    deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, Article) and obj.id is not None]
+    if deleted_ids:
+        rows = session.connection().execute(
+            select(article_tags.c.tag_id).where(article_tags.c.article_id.in_(deleted_ids))
+        )
+        deltas = session.info.setdefault("tag_usage_deltas", Counter())
+        for (tag_id,) in rows:
+            deltas[tag_id] -= 1
+
+@event.listens_for(Session, "after_flush")
+def _apply_tag_usage_deltas(session, flush_context):
+    deltas = session.info.pop("tag_usage_deltas", Counter())
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Article):
+            history = attributes.get_history(obj, "tags", passive=attributes.PASSIVE_NO_INITIALIZE)
+            for tag in history.added or ():
+                deltas[tag.id] += 1
+            for tag in history.deleted or ():
+                deltas[tag.id] -= 1
+
+    by_delta = {}
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        tags = Tag.__table__
+        session.connection().execute(
+            update(tags).where(tags.c.id.in_(tag_ids)).values(usage_count=tags.c.usage_count + delta)
+        )
+    if by_delta:
+        session.info["tag_usage_changed"] = True
+
+@event.listens_for(Session, "after_flush")
+def _apply_comment_count_deltas(session, flush_context):
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Comment):
+            deltas[obj.article_id] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Comment):
+            deltas[obj.article_id] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Comment):
+            history = attributes.get_history(obj, "article_id", passive=attributes.PASSIVE_NO_INITIALIZE)
+            for article_id in history.added or ():
+                deltas[article_id] += 1
+            for article_id in history.deleted or ():
+                deltas[article_id] -= 1
+
+    articles = Article.__table__
+    for article_id, delta in deltas.items():
+        if article_id is not None and delta:
+            session.connection().execute(
+                update(articles)
+                .where(articles.c.id == article_id)
+                .values(comments_count=articles.c.comments_count + delta)
+            )
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_table_versions(session, flush_context):
+    # Writes that bypass the unit of work (Core INSERTs) note their tables themselves
+    note_changed_tables(session, {obj.__table__.name for obj in chain(session.new, session.dirty, session.deleted)})
@@ -0,0 +1,85 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+from typing import Iterable, List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+from app.db.session import async_engine, get_async_database_url, make_async_engine
+
+logger = logging.getLogger(__name__)
+
+class ReplicaSet:
+    """Round-robin over healthy read replicas, falling back to the primary.
+
+    A replica is taken out of rotation when a health check or a read on it fails,
+    and put back once a later health check succeeds.
+    """
+
+    def __init__(self, primary: AsyncEngine, engines: Iterable[AsyncEngine] = ()):
+        self.primary = primary
+        self.engines: List[AsyncEngine] = list(engines)
+        self.down = set()
+        self._turn = itertools.count()
+        self._health_task: Optional[asyncio.Task] = None
+
+    def choose(self) -> AsyncEngine:
+        healthy = [engine for engine in self.engines if engine not in self.down]
+        if not healthy:
+            return self.primary
+        return healthy[next(self._turn) % len(healthy)]
+
+    def mark_down(self, engine: AsyncEngine):
+        if engine is not self.primary and engine not in self.down:
+            logger.warning("Read replica %s marked down", engine.url.render_as_string())
+            self.down.add(engine)
+
+    async def ping(self, engine: AsyncEngine) -> bool:
+        # The timeout covers connecting too: a replica that hangs there must not stall startup
+        try:
+            await asyncio.wait_for(self._select_one(engine), settings.REPLICA_HEALTH_CHECK_TIMEOUT)
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    async def _select_one(engine: AsyncEngine):
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def check_health(self):
+        results = await asyncio.gather(*(self.ping(engine) for engine in self.engines))
+        for engine, healthy in zip(self.engines, results):
+            if not healthy:
+                self.mark_down(engine)
+            elif engine in self.down:
+                logger.info("Read replica %s back in rotation", engine.url.render_as_string())
+                self.down.discard(engine)
+
+    async def _check_periodically(self):
+        while True:
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL)
+            await self.check_health()
+
+    async def start(self):
+        if self.engines:
+            if not settings.AUTH_CACHE_URL:
+                logger.warning("Read replicas without AUTH_CACHE_URL: read-your-writes only holds "
+                               "for reads served by the worker that took the write")
+            await self.check_health()
+            self._health_task = asyncio.create_task(self._check_periodically())
+
+    async def stop(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_task
+            self._health_task = None
+        for engine in self.engines:
+            await engine.dispose()
+
+def replica_urls() -> List[str]:
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+replicas = ReplicaSet(async_engine, [make_async_engine(get_async_database_url(url)) for url in replica_urls()])
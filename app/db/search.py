@@ -0,0 +1,45 @@
+from sqlalchemy import DDL, event
+from .models import Article
+
+# Full-text index over articles.title/description/body for each backend.
+# Alembic migration 3b9d6a2f41c7 creates the same objects on existing databases;
+# these hooks cover databases built with create_all.
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, description, body, content='articles', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, description, body) "
+    "VALUES (new.id, new.title, new.description, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description, body) "
+    "VALUES ('delete', old.id, old.title, old.description, old.body); END",
+    # Only text changes touch the index; counter updates on articles stay cheap
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, description, body ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description, body) "
+    "VALUES ('delete', old.id, old.title, old.description, old.body); "
+    "INSERT INTO articles_fts(rowid, title, description, body) "
+    "VALUES (new.id, new.title, new.description, new.body); END",
+]
+
+MYSQL_DDL = [
+    "ALTER TABLE articles ADD FULLTEXT INDEX ft_articles_search (title, description, body)",
+]
+
+POSTGRESQL_DDL = [
+    "ALTER TABLE articles ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'C')) STORED",
+    "CREATE INDEX ix_articles_search_vector ON articles USING GIN (search_vector)",
+]
+
+for statement in SQLITE_DDL:
+    event.listen(Article.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in MYSQL_DDL:
+    event.listen(Article.__table__, "after_create", DDL(statement).execute_if(dialect="mysql"))
+for statement in POSTGRESQL_DDL:
+    event.listen(Article.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    Article.__table__, "before_drop", DDL("DROP TABLE IF EXISTS articles_fts").execute_if(dialect="sqlite")
+)
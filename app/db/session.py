@@ -1,20 +1,176 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from typing import Callable, Optional
+from sqlalchemy import create_engine, event, orm
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import pool_checkout_duration, record_query, register_collector, sample
+
+logger = logging.getLogger(__name__)
+
+# Async drivers used for each backend when DATABASE_URL names a sync one
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def get_async_database_url(database_url: str, override: Optional[str] = None) -> str:
+    if override:
+        return override
+    url = make_url(database_url)
+    if url.drivername in ASYNC_DRIVERS.values() or url.drivername == "mysql+asyncmy":
+        return database_url
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits for a connection."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_checkout_duration.observe(time.perf_counter() - started)
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+def pool_options(url: str) -> dict:
+    """Pool sizing from settings; in-memory SQLite keeps its single-connection pool."""
+    if _is_memory_sqlite(url):
+        return {}
+    pre_ping = settings.DB_POOL_PRE_PING
+    if pre_ping is None:
+        pre_ping = make_url(url).get_backend_name() != "sqlite"
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": pre_ping,
+    }
+
+def _async_engine_options(url: str) -> dict:
+    if _is_memory_sqlite(url):
+        return {}
+    return {"poolclass": InstrumentedAsyncQueuePool, **pool_options(url)}
+
+def sqlite_pragmas() -> dict:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,
+    }
+
+def apply_sqlite_pragmas(engine):
+    """Set WAL, synchronous, busy timeout and cache PRAGMAs on each new SQLite connection."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def instrument_engine(engine):
+    """Count statements and database time against the request being served."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        record_query(time.perf_counter() - conn.info["query_started"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(context):
+        # A failed statement never reaches after_cursor_execute
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+AFTER_COMMIT = "after_commit_writes"
+
+class Session(orm.Session):
+    """Session that runs bookkeeping writes queued with run_after_commit once a commit succeeds.
+
+    They get a short transaction of their own, so a shared bookkeeping row is never
+    locked for the length of the transaction that caused the write. If it fails, the
+    data is still committed; the failure is logged rather than raised to the writer.
+    A rollback leaves the queue alone: the writes must be safe to run one time too many.
+    """
+
+    def commit(self):
+        super().commit()
+        writes = self.info.pop(AFTER_COMMIT, None)
+        if not writes:
+            return
+        try:
+            for write in writes.values():
+                write(self)
+            super().commit()
+        except SQLAlchemyError:
+            logger.exception("Writes after commit failed: %s", ", ".join(writes))
+            self.rollback()
+
+def run_after_commit(session, key: str, write: Callable[[orm.Session], None]):
+    """Queue write(session) to run after the session's next successful commit; one per key."""
+    if isinstance(session, AsyncSession):
+        session = session.sync_session
+    session.info.setdefault(AFTER_COMMIT, {})[key] = write
 
 # Database Engine Creation
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL))
 
 # Create a configured "Session" class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=Session, autocommit=False, autoflush=False, bind=engine)
+
+# Async engine and session factory used by the API
+async_database_url = get_async_database_url(settings.DATABASE_URL, settings.ASYNC_DATABASE_URL)
+def make_async_engine(url: str):
+    """Async engine with the pool settings, SQLite PRAGMAs and query metrics the API expects."""
+    async_engine = create_async_engine(url, **_async_engine_options(url))
+    apply_sqlite_pragmas(async_engine.sync_engine)
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+async_engine = make_async_engine(async_database_url)
+
+apply_sqlite_pragmas(engine)
+instrument_engine(engine)
+
+@register_collector
+def _pool_gauges():
+    pool = async_engine.pool
+    if not isinstance(pool, QueuePool):
+        return []
+    return [
+        *sample("db_pool_size", "gauge", "Configured number of pooled connections.", pool.size()),
+        *sample("db_pool_checked_out", "gauge", "Connections currently checked out.", pool.checkedout()),
+        *sample("db_pool_checked_in", "gauge", "Idle connections held by the pool.", pool.checkedin()),
+        # Negative while the pool is still filling up to its size
+        *sample("db_pool_overflow", "gauge", "Connections open beyond the pool size.", pool.overflow()),
+    ]
+
+# expire_on_commit=False so attributes stay readable after commit without lazy IO
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, sync_session_class=Session, autoflush=False, expire_on_commit=False
+)
 
 # Base class for all models
 Base = declarative_base()
-
-# Dependency for retrieving the database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -1,22 +1,44 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from starlette.datastructures import URL
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.api.routes import todos, users
-from app.db.base import init_db
-
-init_db()
-app = FastAPI()
-
-class TrailingSlashMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        if path != "/" and not path.endswith("/"):
-            # Rewrite the URL path internally to add the trailing slash
-            request.scope["path"] = path + "/"
-        response = await call_next(request)
-        return response
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.api.routes import articles, metrics, profiles, tags, todos, users
+from app.core.metrics import MetricsMiddleware
+from app.core.security.hashing import shutdown_executor
+from app.core.config import settings
+from app.db.base import prepare_database
+from app.db.replicas import replicas
+from app.db.session import async_engine
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema work happens once per worker at startup, not at import
+    await prepare_database(settings.DB_STARTUP)
+    await replicas.start()
+    yield
+    shutdown_executor()
+    await replicas.stop()
+    await async_engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
+
+class TrailingSlashMiddleware:
+    """Pure ASGI path rewrite; no per-request tasks or body streams."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path != "/" and not path.endswith("/"):
+                # Rewrite the URL path internally to add the trailing slash
+                scope = {**scope, "path": path + "/"}
+        await self.app(scope, receive, send)
 
+# Added first so it runs inside the path rewrite and sees the route the router matched
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(TrailingSlashMiddleware)
 
 """
@@ -44,4 +66,8 @@ The -L flag makes curl follow the redirect and display the final response
 #     return response
 
 app.include_router(todos.router)
-app.include_router(users.router)
\ No newline at end of file
+app.include_router(users.router)
+app.include_router(articles.router)
+app.include_router(profiles.router)
+app.include_router(tags.router)
+app.include_router(metrics.router)
\ No newline at end of file
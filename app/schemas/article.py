@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
-from .user import UserResponse
+from .user import ProfileResponse
 
 class ArticleBase(BaseModel):
     title: str
@@ -10,16 +10,41 @@ class ArticleBase(BaseModel):
 class ArticleCreate(ArticleBase):
     tag_list: Optional[List[str]] = []
 
-class ArticleResponse(ArticleBase):
+class ArticleCreateWrapper(BaseModel):
+    article: ArticleCreate
+
+class ArticleSummary(BaseModel):
+    # List view: everything except the body
     id: int
     slug: str
-    author: UserResponse
+    title: str
+    description: str
+    tag_list: List[str] = []
+    comments_count: int = 0
+    author: ProfileResponse
 
     class Config(ConfigDict):
         from_attributes = True
 
+class ArticleResponse(ArticleSummary):
+    body: str
+
+class ArticleListResponse(BaseModel):
+    articles: List[ArticleSummary]
+    articles_count: int
+
+class ArticleFeedPage(BaseModel):
+    articles: List[ArticleSummary]
+    next_cursor: Optional[str] = None
+
+class ArticleResponseWrapper(BaseModel):
+    article: ArticleResponse
+
 class TagResponse(BaseModel):
     name: str
 
     class Config(ConfigDict):
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TagListResponse(BaseModel):
+    tags: List[str]
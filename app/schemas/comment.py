@@ -0,0 +1,24 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from .user import ProfileResponse
+
+class CommentCreate(BaseModel):
+    body: str
+
+class CommentResponse(BaseModel):
+    id: int
+    body: str
+    author: ProfileResponse
+
+    class Config(ConfigDict):
+        from_attributes = True
+
+class CommentCreateWrapper(BaseModel):
+    comment: CommentCreate
+
+class CommentResponseWrapper(BaseModel):
+    comment: CommentResponse
+
+class CommentPage(BaseModel):
+    comments: List[CommentResponse]
+    next_cursor: Optional[str] = None
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, ConfigDict
+from typing import Any, List, Optional
 
 class TodoCreate(BaseModel):
     title: str
@@ -14,4 +15,20 @@ class TodoResponse(TodoCreate):
     completed: bool
 
     class Config(ConfigDict):
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TodoPage(BaseModel):
+    items: List[TodoResponse]
+    next_cursor: Optional[str] = None
+
+class TodoBulkCreated(BaseModel):
+    index: int
+    id: int
+
+class TodoBulkError(BaseModel):
+    index: int
+    detail: Any
+
+class TodoBulkResponse(BaseModel):
+    created: List[TodoBulkCreated]
+    errors: List[TodoBulkError]
@@ -24,6 +24,20 @@ class UserResponse(UserBase):
     class Config(ConfigDict):
         from_attributes = True
 
+class ProfileResponse(BaseModel):
+    username: str
+    bio: Optional[str] = None
+    image: Optional[str] = None
+
+    class Config(ConfigDict):
+        from_attributes = True
+
+class FollowProfileResponse(ProfileResponse):
+    following: bool = False
+
+class ProfileResponseWrapper(BaseModel):
+    profile: FollowProfileResponse
+
 class UserCreateWrapper(BaseModel):
     user: UserCreate
 
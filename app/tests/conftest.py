@@ -0,0 +1,19 @@
+import os
+import shutil
+import tempfile
+import pytest
+
+# Before any app import: settings and engines read DATABASE_URL once. A throwaway file
+# keeps create_all away from the developer's database, which may be at an older revision.
+_database_dir = tempfile.mkdtemp(prefix="realworld-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_dir}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret-key-0123456789abcdef0123")
+
+from app.db.base import init_db  # noqa: E402
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    # The app no longer creates tables at import; tests run against a create_all schema
+    init_db()
+    yield
+    shutil.rmtree(_database_dir, ignore_errors=True)
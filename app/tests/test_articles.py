@@ -0,0 +1,83 @@
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.models import Article, Tag, User
+from app.db.session import SessionLocal
+from app.tests.utils import count_queries
+
+client = TestClient(app)
+
+def create_articles(count: int) -> str:
+    suffix = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        author = User(username=f"author-{suffix}", email=f"author-{suffix}@example.com", password="x")
+        tags = [Tag(name=f"tag-{suffix}-{i}") for i in range(3)]
+        for i in range(count):
+            db.add(Article(slug=f"article-{suffix}-{i}", title=f"Article {i}", description="About",
+                           body="Body " * 100, author=author, tags=tags[: i % 3 + 1]))
+        db.commit()
+    return suffix
+
+def test_list_articles_filters_without_bodies():
+    suffix = create_articles(5)
+
+    response = client.get("/api/articles", params={"author": f"author-{suffix}"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["articles_count"] == 5
+    assert [a["slug"] for a in data["articles"]] == [f"article-{suffix}-{i}" for i in reversed(range(5))]
+    assert "body" not in data["articles"][0]
+    assert data["articles"][0]["author"]["username"] == f"author-{suffix}"
+
+    data = client.get("/api/articles", params={"tag": f"tag-{suffix}-2"}).json()
+    assert data["articles_count"] == 1
+    assert data["articles"][0]["tag_list"] == [f"tag-{suffix}-{i}" for i in range(3)]
+
+def test_list_articles_query_count_is_fixed():
+    suffix = create_articles(2)
+    _, few = count_queries(lambda: client.get("/api/articles", params={"author": f"author-{suffix}"}))
+    create_articles(10)
+    _, many = count_queries(lambda: client.get("/api/articles", params={"limit": 12}))
+    assert few == many
+
+def test_read_article():
+    suffix = create_articles(1)
+    response = client.get(f"/api/articles/article-{suffix}-0")
+    assert response.status_code == 200
+    assert response.json()["article"]["body"].startswith("Body")
+    assert client.get("/api/articles/missing").status_code == 404
+
+def test_search_articles_ranks_title_matches_first():
+    suffix = uuid.uuid4().hex[:8]
+    word = f"zebra{suffix}"
+    with SessionLocal() as db:
+        author = User(username=f"searcher-{suffix}", email=f"searcher-{suffix}@example.com", password="x")
+        db.add(Article(slug=f"body-{suffix}", title="Other", description="D", body=f"mentions {word}", author=author))
+        db.add(Article(slug=f"title-{suffix}", title=f"All about {word}", description="D", body="B", author=author))
+        db.add(Article(slug=f"none-{suffix}", title="Nothing", description="D", body="B", author=author))
+        db.commit()
+
+    data = client.get("/api/articles/search", params={"q": word}).json()
+    assert data["articles_count"] == 2
+    assert [a["slug"] for a in data["articles"]] == [f"title-{suffix}", f"body-{suffix}"]
+
+    with SessionLocal() as db:
+        article = db.query(Article).filter(Article.slug == f"title-{suffix}").one()
+        article.title = "Renamed"
+        db.commit()
+    data = client.get("/api/articles/search", params={"q": f'"{word}*'}).json()
+    assert [a["slug"] for a in data["articles"]] == [f"body-{suffix}"]
+
+def test_read_article_conditional_get():
+    suffix = create_articles(1)
+    url = f"/api/articles/article-{suffix}-0"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+
+    with SessionLocal() as db:
+        author = db.query(User).filter(User.username == f"author-{suffix}").one()
+        author.bio = "Updated bio"
+        db.commit()
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["article"]["author"]["bio"] == "Updated bio"
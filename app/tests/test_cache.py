@@ -0,0 +1,79 @@
+import asyncio
+from app.core.cache import LocalCacheBackend, TTLCache
+
+def test_ttl_cache_evicts_and_expires():
+    cache = TTLCache("test", ttl=60, backend=LocalCacheBackend(maxsize=2))
+
+    async def scenario():
+        await cache.set(1, {"id": 1})
+        await cache.set(2, {"id": 2})
+        await cache.set(3, {"id": 3})
+        assert await cache.get(1) is None
+        assert await cache.get(3) == {"id": 3}
+        await cache.set(4, {"id": 4}, ttl=0)
+        assert await cache.get(4) is None
+        await cache.delete(3)
+        assert await cache.get(3) is None
+
+    asyncio.run(scenario())
+    assert cache.stats() == {"hits": 1, "misses": 3}
+
+def test_cached_user_can_be_updated():
+    from app.core.cache import user_cache
+    from app.db.base import init_db
+    from app.crud.user import get_cached_user_row_by_id, update_user
+    from app.db.models import User
+    from app.db.session import AsyncSessionLocal
+    from app.schemas.user import UserUpdate
+
+    init_db()
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            user = User(username="cacheuser", email="cacheuser@example.com", password="x")
+            db.add(user)
+            await db.commit()
+            user_id = user.id
+        async with AsyncSessionLocal() as db:
+            await get_cached_user_row_by_id(db, user_id)
+        hits = user_cache.hits
+        async with AsyncSessionLocal() as db:
+            cached = await get_cached_user_row_by_id(db, user_id)
+            assert user_cache.hits == hits + 1
+            updated = await update_user(db, user=cached, user_update=UserUpdate(bio="from cache"))
+            assert updated == cached._replace(bio="from cache")
+        async with AsyncSessionLocal() as db:
+            assert (await db.get(User, user_id)).bio == "from cache"
+            await db.delete(await db.get(User, user_id))
+            await db.commit()
+        assert await user_cache.get(user_id) is None
+
+    asyncio.run(scenario())
+
+def test_user_row_reader_caches_only_public_fields():
+    from app.core.cache import user_cache
+    from app.db.base import init_db
+    from app.crud.user import UserRow, get_cached_user_row_by_id
+    from app.db.models import User
+    from app.db.session import AsyncSessionLocal
+
+    init_db()
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            user = User(username="rowuser", email="rowuser@example.com", password="x", bio="Row")
+            db.add(user)
+            await db.commit()
+            user_id = user.id
+        async with AsyncSessionLocal() as db:
+            row = await get_cached_user_row_by_id(db, user_id)
+            assert row == UserRow(user_id, "rowuser", "rowuser@example.com", "Row", None)
+            assert not db.identity_map
+        assert "password" not in await user_cache.get(user_id)
+        hits = user_cache.hits
+        async with AsyncSessionLocal() as db:
+            assert await get_cached_user_row_by_id(db, user_id) == row
+            assert await get_cached_user_row_by_id(db, 0) is None
+        assert user_cache.hits == hits + 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,41 @@
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.models import Article, User
+from app.db.session import SessionLocal
+
+client = TestClient(app)
+
+def test_comments_paginate_and_maintain_count():
+    suffix = uuid.uuid4().hex[:8]
+    registered = client.post("/api/users/", json={"user": {
+        "username": f"commenter-{suffix}", "email": f"commenter-{suffix}@example.com", "password": "password123"
+    }}).json()["user"]
+    headers = {"Authorization": f"Token {registered['token']}"}
+    with SessionLocal() as db:
+        author = db.get(User, registered["id"])
+        db.add(Article(slug=f"discussed-{suffix}", title="T", description="D", body="B", author=author))
+        db.commit()
+
+    ids = []
+    for i in range(5):
+        response = client.post(f"/api/articles/discussed-{suffix}/comments",
+                               json={"comment": {"body": f"Comment {i}"}}, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["comment"]["author"]["username"] == f"commenter-{suffix}"
+        ids.append(response.json()["comment"]["id"])
+
+    seen, cursor = [], None
+    while True:
+        page = client.get(f"/api/articles/discussed-{suffix}/comments",
+                          params={"limit": 2, **({"cursor": cursor} if cursor else {})}).json()
+        seen.extend(comment["id"] for comment in page["comments"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ids
+
+    response = client.delete(f"/api/articles/discussed-{suffix}/comments/{ids[0]}", headers=headers)
+    assert response.status_code == 204
+    articles = client.get("/api/articles", params={"author": f"commenter-{suffix}"}).json()["articles"]
+    assert articles[0]["comments_count"] == 4
@@ -0,0 +1,112 @@
+import uuid
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.core.security.jwt import create_access_token
+from app.db.models import User, feed_entries
+from app.db.session import SessionLocal
+from app.main import app
+
+client = TestClient(app)
+
+def make_users(*names):
+    suffix = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        users = [User(username=f"{name}-{suffix}", email=f"{name}-{suffix}@example.com", password="x")
+                 for name in names]
+        db.add_all(users)
+        db.commit()
+        return [(user.username, {"Authorization": f"Token {create_access_token({'sub': str(user.id)})}"})
+                for user in users]
+
+def publish(headers, title):
+    response = client.post("/api/articles", json={"article": {
+        "title": title, "description": "D", "body": "B", "tag_list": ["feed"],
+    }}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["article"]
+
+def feed(headers, **params):
+    response = client.get("/api/articles/feed", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def feed_titles(headers):
+    return [article["title"] for article in feed(headers, limit=50)["articles"]]
+
+def stored_entries(article_id):
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(feed_entries).where(feed_entries.c.article_id == article_id))
+
+def test_feed_fans_out_on_write_and_merges_celebrities_on_read(monkeypatch):
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 2)
+    (author, author_headers), (star, star_headers), (_, reader), (_, fan) = make_users("author", "star", "reader", "fan")
+
+    publish(author_headers, "Before following")
+    followed = client.post(f"/api/profiles/{author}/follow", headers=reader)
+    assert followed.json()["profile"] == {"username": author, "bio": None, "image": None, "following": True}
+    # Following copies in the author's latest articles
+    assert feed_titles(reader) == ["Before following"]
+
+    published = publish(author_headers, "After following")
+    assert published["author"]["username"] == author and published["tag_list"] == ["feed"]
+    assert stored_entries(published["id"]) == 1
+    assert feed_titles(reader) == ["After following", "Before following"]
+
+    # Two followers reach the threshold: the star's articles are not fanned out but still in the feed
+    client.post(f"/api/profiles/{star}/follow", headers=reader)
+    client.post(f"/api/profiles/{star}/follow", headers=fan)
+    starred = publish(star_headers, "Celebrity post")
+    assert stored_entries(starred["id"]) == 0
+    assert feed_titles(reader) == ["Celebrity post", "After following", "Before following"]
+
+    first = feed(reader, limit=2)
+    assert [article["title"] for article in first["articles"]] == ["Celebrity post", "After following"]
+    rest = feed(reader, limit=2, cursor=first["next_cursor"])
+    assert [article["title"] for article in rest["articles"]] == ["Before following"]
+    assert rest["next_cursor"] is None
+
+    unfollowed = client.delete(f"/api/profiles/{author}/follow", headers=reader)
+    assert unfollowed.json()["profile"]["following"] is False
+    assert feed_titles(reader) == ["Celebrity post"]
+
+    # Dropping back under the threshold fans the star's latest articles out to remaining followers
+    client.delete(f"/api/profiles/{star}/follow", headers=fan)
+    assert stored_entries(starred["id"]) == 1
+    assert feed_titles(reader) == ["Celebrity post"]
+    assert feed_titles(fan) == []
+
+def test_profiles_and_feed_errors():
+    (author, author_headers), (_, reader) = make_users("author", "reader")
+    assert client.get("/api/articles/feed").status_code == 403
+    assert client.get("/api/articles/feed", params={"cursor": "bad"}, headers=reader).status_code == 400
+    assert client.post(f"/api/profiles/{author}/follow", headers=author_headers).status_code == 400
+    assert client.post("/api/profiles/nobody-at-all/follow", headers=reader).status_code == 404
+
+    assert client.get(f"/api/profiles/{author}", headers=reader).json()["profile"]["following"] is False
+    client.post(f"/api/profiles/{author}/follow", headers=reader)
+    # The repeat hits the primary key and is skipped; the count below stays at one
+    assert client.post(f"/api/profiles/{author}/follow", headers=reader).status_code == 200
+    assert client.get(f"/api/profiles/{author}", headers=reader).json()["profile"]["following"] is True
+    assert client.get(f"/api/profiles/{author}").json()["profile"]["following"] is False
+    # A stale token reads the public profile rather than failing
+    expired = create_access_token({"sub": "1"}, expires_delta=timedelta(minutes=-1))
+    stale = client.get(f"/api/profiles/{author}", headers={"Authorization": f"Token {expired}"})
+    assert stale.status_code == 200 and stale.json()["profile"]["following"] is False
+
+    with SessionLocal() as db:
+        assert db.scalar(select(User.followers_count).where(User.username == author)) == 1
+
+def test_profile_conditional_get():
+    (author, _), (_, reader), (_, other) = make_users("author", "reader", "other")
+    first = client.get(f"/api/profiles/{author}", headers=reader)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert client.get(f"/api/profiles/{author}", headers={**reader, "If-None-Match": etag}).status_code == 304
+    # following is per viewer, so another viewer's copy never matches
+    assert client.get(f"/api/profiles/{author}", headers={**other, "If-None-Match": etag}).status_code == 200
+
+    client.post(f"/api/profiles/{author}/follow", headers=reader)
+    changed = client.get(f"/api/profiles/{author}", headers={**reader, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["profile"]["following"] is True
@@ -0,0 +1,72 @@
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+from app.tests.test_articles import create_articles
+from app.tests.utils import assert_max_queries
+
+client = TestClient(app)
+
+def metric_value(text: str, line_prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not found")
+
+def test_metrics_exposes_route_histograms_pool_and_hashing():
+    suffix = create_articles(1)
+    client.get(f"/api/articles/article-{suffix}-0")
+    client.get(f"/api/articles/article-{suffix}-0")
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+
+    # Labelled by route template, not by concrete path
+    route = 'method="GET",route="/api/articles/{slug}/"'
+    assert metric_value(text, f'http_request_duration_seconds_count{{{route},status="200"}}') >= 2
+    assert metric_value(text, f"http_request_db_queries_count{{{route}}}") >= 2
+    assert metric_value(text, f"http_request_db_queries_sum{{{route}}}") >= 6
+    assert metric_value(text, f"http_request_db_seconds_sum{{{route}}}") > 0
+    assert 'route="unmatched",status="404"' in text
+    assert f"article-{suffix}" not in text
+
+    assert metric_value(text, "db_pool_checkout_seconds_count") > 0
+    assert "db_pool_checked_out " in text
+    assert "db_pool_overflow " in text
+    assert "password_hash_seconds_total " in text
+
+def test_metrics_exposes_cache_hits_and_misses():
+    from app.core.cache import token_cache
+    misses = token_cache.misses
+    client.get("/api/articles/feed", headers={"Authorization": f"Token not-a-{uuid.uuid4().hex}"})
+    text = client.get("/metrics").text
+    assert metric_value(text, 'cache_misses_total{cache="token"}') == misses + 1
+    assert metric_value(text, 'cache_hits_total{cache="token"}') == token_cache.hits
+    assert 'cache_hits_total{cache="user"}' in text
+    assert 'cache_misses_total{cache="recent_write"}' in text
+
+def test_endpoint_query_budgets():
+    suffix = create_articles(5)
+    registered = client.post("/api/users/", json={"user": {
+        "username": f"budget-{suffix}", "email": f"budget-{suffix}@example.com", "password": "password123"
+    }}).json()["user"]
+    headers = {"Authorization": f"Token {registered['token']}"}
+    client.get("/api/tags")
+
+    # Reads include one table_versions lookup for the ETag
+    with assert_max_queries(4):
+        client.get("/api/articles", params={"limit": 20})
+    with assert_max_queries(3):
+        client.get(f"/api/articles/article-{suffix}-0")
+    with assert_max_queries(3):
+        client.get(f"/api/articles/article-{suffix}-0/comments")
+    with assert_max_queries(2):
+        client.get("/todos/", params={"cursor": "", "limit": 50})
+    etag = client.get("/todos/").headers["etag"]
+    with assert_max_queries(1):
+        assert client.get("/todos/", headers={"If-None-Match": etag}).status_code == 304
+    # Writes also bump their table_versions rows; UPDATE ... RETURNING needs no reload
+    with assert_max_queries(3):
+        client.put("/api/users/", json={"user": {"bio": uuid.uuid4().hex}}, headers=headers)
@@ -0,0 +1,117 @@
+import asyncio
+import uuid
+import pytest
+from sqlalchemy import event
+from app.db.base import init_db
+from app.db.models import Article, Comment, Tag, TodoItem, User
+from app.db.session import AsyncSessionLocal, SessionLocal, async_engine, engine
+from app.crud.article import count_articles, get_article_by_slug, get_article_id_by_slug, get_articles, search_articles
+from app.crud.comment import get_comment, get_comments_after
+from app.crud.tag import get_popular_tags
+from app.crud.todo import get_todo_rows, get_todo_rows_after, stream_todo_rows
+from app.crud.user import get_user_by_email, get_user_by_username, get_user_row_by_id
+
+init_db()
+
+def query_plans(crud, *args, **kwargs):
+    """Run an async CRUD call and return the SQLite query plan of every SELECT it issued."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            await crud(db, *args, **kwargs)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        asyncio.run(run())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", tuple(parameters)).all()
+            plans.append([row[-1] for row in rows])
+    assert plans, "no SELECT was issued"
+    return plans
+
+def assert_no_full_scan(plans, allow=()):
+    """Fail on "SCAN <table>" that walks a table without an index.
+
+    allow names tables an unfiltered, LIMIT-bounded listing may walk in key order.
+    """
+    for plan in plans:
+        for detail in plan:
+            if detail.startswith("SCAN ") and "INDEX" not in detail:
+                assert detail.split()[1] in allow, plan
+
+@pytest.fixture(scope="module")
+def seeded():
+    # Enough rows that eager loads (selectinload) actually issue their queries
+    suffix = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        user = User(username=f"planner-{suffix}", email=f"planner-{suffix}@example.com", password="x")
+        tag = Tag(name=f"plan-{suffix}")
+        article = Article(slug=f"plan-{suffix}", title="Plan", description="D", body="B", author=user, tags=[tag])
+        db.add_all([user, article, Comment(body="C", author=user, article=article),
+                    TodoItem(title="Plan", description="D")])
+        db.commit()
+        return {"suffix": suffix, "user_id": user.id, "article_id": article.id}
+
+def test_user_lookups_use_indexes():
+    for crud, kwargs in (
+        (get_user_row_by_id, {"user_id": 1}),
+        (get_user_by_email, {"email": "Someone@Example.com"}),
+        (get_user_by_username, {"username": "someone"}),
+    ):
+        assert_no_full_scan(query_plans(crud, **kwargs))
+
+def test_todo_queries_use_indexes():
+    async def export(db, **kwargs):
+        async for _ in stream_todo_rows(db, **kwargs):
+            pass
+
+    for order_by, after in (("id", [1, 1]), ("title", ["Plan", 1]), ("completed", [False, 1])):
+        assert_no_full_scan(query_plans(get_todo_rows_after, order_by=order_by, after=after))
+    assert_no_full_scan(query_plans(export, completed=False, after_id=1))
+    # Unfiltered first pages walk the table in key order and stop at LIMIT
+    assert_no_full_scan(query_plans(get_todo_rows_after, order_by="id"), allow={"todos"})
+    assert_no_full_scan(query_plans(get_todo_rows, skip=0, limit=10), allow={"todos"})
+
+def test_article_queries_use_indexes(seeded):
+    suffix = seeded["suffix"]
+    for crud, kwargs in (
+        (get_articles, {"author": f"planner-{suffix}"}),
+        (get_articles, {"tag": f"plan-{suffix}"}),
+        (count_articles, {"author": f"planner-{suffix}"}),
+        (count_articles, {"tag": f"plan-{suffix}"}),
+        (get_article_by_slug, {"slug": f"plan-{suffix}"}),
+        (get_article_id_by_slug, {"slug": f"plan-{suffix}"}),
+        (search_articles, {"terms": "Plan"}),
+    ):
+        assert_no_full_scan(query_plans(crud, **kwargs))
+    assert_no_full_scan(query_plans(get_articles), allow={"articles"})
+
+def test_comment_and_tag_queries_use_indexes(seeded):
+    assert_no_full_scan(query_plans(get_comments_after, article_id=seeded["article_id"]))
+    assert_no_full_scan(query_plans(get_comments_after, article_id=seeded["article_id"], after_id=1))
+    assert_no_full_scan(query_plans(get_comment, article_id=seeded["article_id"], comment_id=1))
+    assert_no_full_scan(query_plans(get_popular_tags, limit=5))
+
+def test_feed_queries_use_indexes(seeded):
+    from sqlalchemy import insert
+    from app.crud.feed import get_feed_articles
+    from app.db.models import feed_entries
+
+    with SessionLocal() as db:
+        db.execute(insert(feed_entries), {"user_id": seeded["user_id"], "article_id": seeded["article_id"]})
+        db.commit()
+    plans = query_plans(get_feed_articles, user_id=seeded["user_id"], before_id=seeded["article_id"] + 1)
+    # anon_* are the LIMIT-bounded id lists merged by the UNION
+    assert_no_full_scan(plans, allow={"anon_1", "anon_2"})
+    # The timeline page is a single range over the (user_id, article_id) primary key
+    assert any("feed_entries" in detail and "user_id=? AND article_id<?" in detail for detail in plans[0]), plans[0]
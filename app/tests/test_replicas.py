@@ -0,0 +1,130 @@
+import asyncio
+import uuid
+from datetime import timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+from app.core.cache import recent_writers
+from app.core.security.jwt import create_access_token
+from app.db.models import TodoItem, User
+from app.db.replicas import ReplicaSet, replicas
+from app.db.session import Base, async_engine, get_async_database_url, make_async_engine
+from app.main import app
+
+client = TestClient(app)
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    # A second SQLite file stands in for a replica that has not caught up with anything
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_engine = create_engine(url)
+    Base.metadata.create_all(replica_engine)
+    engine = make_async_engine(get_async_database_url(url))
+    monkeypatch.setattr(replicas, "engines", [engine])
+    monkeypatch.setattr(replicas, "down", set())
+    yield replica_engine
+    asyncio.run(recent_writers.clear())
+    asyncio.run(engine.dispose())
+    replica_engine.dispose()
+
+def test_reads_go_to_the_replica_and_writes_to_the_primary(replica):
+    title = f"primary-{uuid.uuid4().hex}"
+    assert client.post("/todos/", json={"title": title, "description": "x"}).status_code == 200
+
+    assert client.get("/todos/", params={"cursor": ""}).json()["items"] == []
+    assert client.get("/todos/export").text == ""
+
+    with replica.begin() as conn:
+        conn.execute(insert(TodoItem), {"title": "replicated", "description": "x", "completed": False})
+    assert [item["title"] for item in client.get("/todos/", params={"cursor": ""}).json()["items"]] == ["replicated"]
+
+def test_reads_stay_on_the_primary_after_the_users_own_write(replica):
+    suffix = uuid.uuid4().hex[:8]
+    registered = client.post("/api/users/", json={"user": {
+        "username": f"ryw-{suffix}", "email": f"ryw-{suffix}@example.com", "password": "password123"
+    }}).json()["user"]
+    headers = {"Authorization": f"Token {registered['token']}"}
+    # Registering opens the window, so the new account can read itself straight away
+    assert client.get("/api/users", headers=headers).json()["user"]["username"] == f"ryw-{suffix}"
+
+    with replica.begin() as conn:
+        conn.execute(insert(User), {"id": registered["id"], "username": f"ryw-{suffix}",
+                                    "email": f"ryw-{suffix}@example.com", "password": "x", "bio": "stale"})
+    asyncio.run(recent_writers.clear())
+    assert client.get("/api/users", headers=headers).json()["user"]["bio"] == "stale"
+
+    assert client.put("/api/users", json={"user": {"bio": "fresh"}}, headers=headers).status_code == 200
+    assert client.get("/api/users", headers=headers).json()["user"]["bio"] == "fresh"
+    # The export streams from the primary inside the window as well
+    assert client.post("/todos/", json={"title": f"ryw-{suffix}", "description": "x"}, headers=headers).status_code == 200
+    assert f"ryw-{suffix}" in client.get("/todos/export", headers=headers).text
+
+    # Once the window has passed, reads go back to the lagging replica
+    asyncio.run(recent_writers.clear())
+    assert client.get("/api/users", headers=headers).json()["user"]["bio"] == "stale"
+
+def test_expired_token_is_anonymous_when_choosing_a_database(replica):
+    suffix = uuid.uuid4().hex[:8]
+    credentials = {"email": f"expired-{suffix}@example.com", "password": "password123"}
+    registered = client.post("/api/users/", json={"user": {"username": f"expired-{suffix}", **credentials}}).json()["user"]
+    expired = create_access_token({"sub": str(registered["id"])}, expires_delta=timedelta(minutes=-1))
+    headers = {"Authorization": f"Token {expired}"}
+
+    # Logging in is how a client gets past an expired token
+    response = client.post("/api/users/login", json={"user": credentials}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["user"]["username"] == f"expired-{suffix}"
+    assert client.get("/api/articles", headers=headers).status_code == 200
+    assert client.get("/todos/", headers=headers).status_code == 200
+
+def test_failed_replica_leaves_the_rotation(replica, tmp_path, monkeypatch):
+    broken = make_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    monkeypatch.setattr(replicas, "engines", [broken])
+
+    with pytest.raises(OperationalError):
+        client.get("/todos/export")
+    assert replicas.down == {broken}
+    # With no healthy replica left, reads fall back to the primary
+    assert client.get("/todos/").status_code == 200
+
+def test_health_checks_and_round_robin(replica):
+    healthy = [replicas.engines[0], make_async_engine(replicas.engines[0].url)]
+    broken = make_async_engine("sqlite+aiosqlite:////nonexistent/dir/replica.db")
+    replica_set = ReplicaSet(async_engine, [*healthy, broken])
+
+    async def scenario():
+        await replica_set.check_health()
+        assert replica_set.down == {broken}
+        assert [replica_set.choose() for _ in range(4)] == healthy * 2
+
+        replica_set.mark_down(healthy[0])
+        assert replica_set.choose() is healthy[1]
+        await replica_set.check_health()
+        assert replica_set.down == {broken}
+
+        replica_set.engines = [broken]
+        assert replica_set.choose() is async_engine
+        await healthy[1].dispose()
+
+    asyncio.run(scenario())
+
+def test_health_check_times_out_while_connecting(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "REPLICA_HEALTH_CHECK_TIMEOUT", 0.05)
+
+    class HangingEngine:
+        """Stands in for a replica that accepts the TCP connection and never answers."""
+        def connect(self):
+            return self
+        async def __aenter__(self):
+            await asyncio.sleep(60)
+        async def __aexit__(self, *exc_info):
+            pass
+
+    hanging = HangingEngine()
+
+    async def scenario():
+        return await asyncio.wait_for(ReplicaSet(async_engine).ping(hanging), 5)
+
+    assert asyncio.run(scenario()) is False
@@ -0,0 +1,27 @@
+import asyncio
+from sqlalchemy import text
+from app.db.session import async_engine, engine, get_async_database_url, pool_options
+
+def test_async_database_url():
+    assert get_async_database_url("sqlite:///database.db") == "sqlite+aiosqlite:///database.db"
+    assert get_async_database_url("mysql+pymysql://u:p@localhost/realworld") == "mysql+aiomysql://u:p@localhost/realworld"
+    assert get_async_database_url("postgresql://u:p@localhost/realworld") == "postgresql+asyncpg://u:p@localhost/realworld"
+    assert get_async_database_url("sqlite:///database.db", "sqlite+aiosqlite:///other.db") == "sqlite+aiosqlite:///other.db"
+
+def test_pool_options():
+    assert pool_options("sqlite://") == {}
+    assert pool_options("sqlite:///database.db")["pool_pre_ping"] is False
+    options = pool_options("postgresql://u:p@localhost/realworld")
+    assert options["pool_pre_ping"] is True
+    assert options["pool_size"] == 5 and options["max_overflow"] == 10 and options["pool_recycle"] == 1800
+
+def test_sqlite_pragmas_applied_on_connect():
+    expected = {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000, "cache_size": -65536}
+    with engine.connect() as conn:
+        assert {name: conn.execute(text(f"PRAGMA {name}")).scalar() for name in expected} == expected
+
+    async def read_async():
+        async with async_engine.connect() as conn:
+            return (await conn.execute(text("PRAGMA synchronous"))).scalar()
+
+    assert asyncio.run(read_async()) == 1
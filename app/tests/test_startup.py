@@ -0,0 +1,61 @@
+import asyncio
+import os
+import subprocess
+import sys
+import pytest
+from alembic import command
+from alembic.script import ScriptDirectory
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+from app.db import base
+from app.db.base import alembic_config, migration_graph, migration_heads, prepare_database
+from app.db.session import get_async_database_url, make_async_engine
+from app.main import app
+
+def test_app_import_is_side_effect_free():
+    # Fresh interpreter: importing the app must not touch the database or load passlib
+    code = "import sys, app.main; print('passlib' in sys.modules, 'alembic' in sys.modules)"
+    env = {**os.environ, "DATABASE_URL": "sqlite:////nonexistent-dir/app.db"}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False"]
+
+def test_migration_heads_match_alembic():
+    assert migration_heads() == set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+def test_startup_check_requires_alembic_head(tmp_path, monkeypatch):
+    # A throwaway file, so stamping head can never mark a real, older database as migrated
+    url = f"sqlite:///{tmp_path / 'startup.db'}"
+    check_engine = make_async_engine(get_async_database_url(url))
+    monkeypatch.setattr(base, "async_engine", check_engine)
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        asyncio.run(prepare_database("check"))
+    with pytest.raises(RuntimeError):
+        with TestClient(app):
+            pass
+
+    command.stamp(alembic_config(), "head")
+    asyncio.run(prepare_database("check"))
+    with TestClient(app) as client:
+        assert client.get("/todos/").status_code == 200
+
+    # Behind head fails; a revision this release has no file for was migrated by a newer one
+    [head] = migration_heads()
+    [behind] = migration_graph()[head]
+    with create_engine(url).begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = :rev"), {"rev": behind})
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        asyncio.run(prepare_database("check"))
+    with create_engine(url).begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = 'from-a-newer-release'"))
+    # Not caplog: alembic's env.py ran fileConfig, which replaced the root handlers
+    warnings = []
+    monkeypatch.setattr(base.logger, "warning", lambda message, *args: warnings.append(message % args))
+    asyncio.run(prepare_database("check"))
+    assert "from-a-newer-release" in warnings[0]
+
+    with pytest.raises(ValueError):
+        asyncio.run(prepare_database("migrate"))
+    asyncio.run(check_engine.dispose())
@@ -0,0 +1,29 @@
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.models import Article, Tag, User
+from app.db.session import SessionLocal
+
+client = TestClient(app)
+
+def test_tags_ordered_by_usage_and_invalidated_on_write():
+    suffix = uuid.uuid4().hex[:8]
+    with SessionLocal() as db:
+        author = User(username=f"tagger-{suffix}", email=f"tagger-{suffix}@example.com", password="x")
+        popular, rare = Tag(name=f"popular-{suffix}"), Tag(name=f"rare-{suffix}")
+        for i in range(3):
+            db.add(Article(slug=f"tagged-{suffix}-{i}", title="T", description="D", body="B",
+                           author=author, tags=[popular] if i else [popular, rare]))
+        db.commit()
+        assert (popular.usage_count, rare.usage_count) == (3, 1)
+
+    tags = client.get("/api/tags", params={"limit": 100}).json()["tags"]
+    assert tags.index(f"popular-{suffix}") < tags.index(f"rare-{suffix}")
+
+    with SessionLocal() as db:
+        article = db.query(Article).filter(Article.slug == f"tagged-{suffix}-0").one()
+        db.delete(article)
+        db.commit()
+        assert db.query(Tag).filter(Tag.name == f"rare-{suffix}").one().usage_count == 0
+
+    assert f"rare-{suffix}" not in client.get("/api/tags", params={"limit": 100}).json()["tags"]
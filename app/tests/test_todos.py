@@ -1,5 +1,12 @@
+import json
+from typing import List, Union
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
 from app.main import app
+from app.api.pagination import encode_cursor
+from app.db.models import TodoItem
+from app.db.session import SessionLocal
+from app.schemas.todo import TodoPage, TodoResponse
 
 client = TestClient(app)
 
@@ -9,3 +16,198 @@ def test_create_todo():
     assert response.json()["title"] == "Test"
 
 # More test cases here...
+
+def test_read_todos_with_cursor():
+    for i in range(3):
+        client.post("/todos/", json={"title": f"Cursor {i}", "description": "Cursor page"})
+
+    for order_by in ("id", "title"):
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            response = client.get("/todos/", params={"cursor": cursor, "limit": 2, "order_by": order_by})
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= 2
+            seen.extend((item[order_by], item["id"]) for item in page["items"])
+            cursor = page["next_cursor"]
+
+        assert seen == sorted(seen)
+        assert len(seen) == len(set(seen))
+
+def test_read_todos_rejects_mismatched_cursor():
+    client.post("/todos/", json={"title": "A", "description": "a"})
+    client.post("/todos/", json={"title": "B", "description": "b"})
+    page = client.get("/todos/", params={"cursor": "", "limit": 1}).json()
+    response = client.get("/todos/", params={"cursor": page["next_cursor"], "order_by": "title"})
+    assert response.status_code == 400
+
+def test_read_todos_rejects_cursor_values_of_the_wrong_type():
+    for values in (["title", {"a": 1}, 5], ["completed", "zz", 1], ["id", 3, "4"], ["id", 3, True]):
+        response = client.get("/todos/", params={"cursor": encode_cursor(values), "order_by": values[0]})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+def test_create_todos_bulk():
+    response = client.post(
+        "/todos/bulk",
+        params={"batch_size": 2},
+        json=[
+            {"title": "Bulk 1", "description": "one"},
+            {"title": "Bulk 2"},
+            {"title": "Bulk 3", "description": "three"},
+            {"title": "Bulk 4", "description": "four"},
+        ],
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["index"] for item in data["created"]] == [0, 2, 3]
+    assert [error["index"] for error in data["errors"]] == [1]
+    ids = [item["id"] for item in data["created"]]
+    assert ids == sorted(ids)
+
+def test_create_todos_bulk_ndjson():
+    body = '{"title": "Line 1", "description": "one"}\nnot json\n{"title": "Line 3", "description": "three"}\n'
+    response = client.post("/todos/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["index"] for item in data["created"]] == [0, 2]
+    assert [error["index"] for error in data["errors"]] == [1]
+
+def test_export_todos():
+    created = client.post("/todos/bulk", json=[{"title": "Export", "description": "row"}] * 3).json()["created"]
+    first_id = created[0]["id"]
+
+    response = client.get("/todos/export", params={"after_id": first_id})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows][:2] == [item["id"] for item in created[1:]]
+    assert all(row["id"] > first_id for row in rows)
+
+    response = client.get("/todos/export", params={"format": "csv", "completed": True})
+    assert response.text.splitlines() == ["id,title,description,completed"]
+
+def test_table_version_bump_runs_after_the_write_commits():
+    from sqlalchemy import event
+    from app.db.session import async_engine
+
+    events = []
+    on_statement = lambda conn, cursor, statement, *args: events.append(" ".join(statement.split()[:3]))
+    on_commit = lambda conn: events.append("COMMIT")
+    event.listen(async_engine.sync_engine, "before_cursor_execute", on_statement)
+    event.listen(async_engine.sync_engine, "commit", on_commit)
+    try:
+        client.post("/todos/", json={"title": "Versioned", "description": "x"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", on_statement)
+        event.remove(async_engine.sync_engine, "commit", on_commit)
+    # The shared table_versions row is only locked by a transaction of its own
+    assert events == ["INSERT INTO todos", "COMMIT", "UPDATE table_versions SET", "COMMIT"]
+
+def test_read_todos_conditional_get():
+    first = client.get("/todos/", params={"cursor": ""})
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "public, no-cache"
+
+    not_modified = client.get("/todos/", params={"cursor": ""}, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    client.post("/todos/", json={"title": "Changed", "description": "Bumps the version"})
+    changed = client.get("/todos/", params={"cursor": ""}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+    client.post("/todos/bulk", json=[{"title": "Bulk", "description": "Core insert"}])
+    assert client.get("/todos/", headers={"If-None-Match": changed.headers["etag"]}).status_code == 200
+
+def test_read_todos_fast_path_matches_response_model():
+    client.post("/todos/", json={"title": "Caf\u00e9 \"quoted\"", "description": "Line\nbreak \u2713"})
+    adapter = TypeAdapter(Union[TodoPage, List[TodoResponse]])
+
+    response = client.get("/todos/", params={"cursor": "", "order_by": "title", "limit": 5})
+    page = response.json()
+    with SessionLocal() as db:
+        items = [db.get(TodoItem, item["id"]) for item in page["items"]]
+        expected = adapter.dump_json(TodoPage(items=items, next_cursor=page["next_cursor"]))
+    assert response.content == expected
+
+    response = client.get("/todos/", params={"skip": 0, "limit": 5})
+    with SessionLocal() as db:
+        items = [db.get(TodoItem, item["id"]) for item in response.json()]
+        assert response.content == adapter.dump_json(adapter.validate_python(items))
+
+def test_coalesced_creates_share_one_commit():
+    import asyncio
+    from app.crud.todo import commit_todo_batch
+    from app.db.coalescer import WriteCoalescer
+    from app.schemas.todo import TodoCreate
+
+    batches = []
+
+    async def commit_batch(todos):
+        batches.append(len(todos))
+        return await commit_todo_batch(todos)
+
+    coalescer = WriteCoalescer("test", commit_batch, window=0.05, max_batch=4)
+
+    async def scenario():
+        todos = [TodoCreate(title=f"Coalesced {i}", description="x") for i in range(6)]
+        return await asyncio.gather(*(coalescer.submit(todo) for todo in todos))
+
+    created = asyncio.run(scenario())
+    # The first four fill a batch; the other two go out when the window closes
+    assert batches == [4, 2]
+    assert [todo["title"] for todo in created] == [f"Coalesced {i}" for i in range(6)]
+    assert len({todo["id"] for todo in created}) == 6
+    with SessionLocal() as db:
+        assert [db.get(TodoItem, todo["id"]).title for todo in created] == [todo["title"] for todo in created]
+
+def test_coalesced_batch_failure_only_fails_the_bad_write():
+    import asyncio
+    from app.db.coalescer import WriteCoalescer
+
+    async def commit_batch(items):
+        if "bad" in items:
+            raise ValueError("bad item")
+        return [item.upper() for item in items]
+
+    coalescer = WriteCoalescer("test", commit_batch, window=0.01, max_batch=10)
+
+    async def scenario():
+        return await asyncio.gather(*(coalescer.submit(item) for item in ("a", "bad", "c")), return_exceptions=True)
+
+    first, second, third = asyncio.run(scenario())
+    assert (first, third) == ("A", "C")
+    assert isinstance(second, ValueError)
+
+def test_create_todo_with_coalescing(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "TODO_WRITE_COALESCING", True)
+    response = client.post("/todos/", json={"title": "Grouped", "description": "Test description"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data == {"title": "Grouped", "description": "Test description", "id": data["id"], "completed": False}
+
+def test_update_and_toggle_todo_in_one_statement_each():
+    from app.tests.utils import assert_max_queries
+    with assert_max_queries(2) as statements:
+        todo = client.post("/todos/", json={"title": "Before", "description": "x"}).json()
+    assert "RETURNING" in statements[0]
+    etag = client.get("/todos/").headers["etag"]
+
+    # The UPDATE ... RETURNING plus the table version bump; no SELECT of the todo
+    with assert_max_queries(2) as statements:
+        response = client.put(f"/todos/{todo['id']}", json={"title": "After", "description": "y", "completed": False})
+    assert response.status_code == 200
+    assert response.json() == {"title": "After", "description": "y", "id": todo["id"], "completed": False}
+    assert not any(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+    assert client.get("/todos/", headers={"If-None-Match": etag}).status_code == 200
+
+    assert client.post(f"/todos/{todo['id']}/toggle").json()["completed"] is True
+    assert client.post(f"/todos/{todo['id']}/toggle").json()["completed"] is False
+
+    assert client.put("/todos/999999999", json={"title": "x", "description": "y", "completed": True}).status_code == 404
+    assert client.post("/todos/999999999/toggle").status_code == 404
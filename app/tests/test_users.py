@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 from app.main import app
+from app.schemas.user import UserResponseWrapper
 
 client = TestClient(app)
 
@@ -19,4 +20,103 @@ def test_create_user():
     assert "user" in data
     assert data["user"]["username"] == "testuser"
     assert data["user"]["email"] == "test@example.com"
-    
\ No newline at end of file
+
+def test_login_user():
+    response = client.post(
+        "/api/users/login",
+        json={"user": {"email": "test@example.com", "password": "password123"}}
+    )
+    assert response.status_code == 200
+    assert response.json()["user"]["token"]
+
+def test_login_sheds_load_when_hash_queue_full(monkeypatch):
+    from app.core.security.hashing import hash_metrics
+    from app.core.config import settings
+    monkeypatch.setattr(hash_metrics, "in_flight", settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE)
+    response = client.post(
+        "/api/users/login",
+        json={"user": {"email": "test@example.com", "password": "password123"}}
+    )
+    assert response.status_code == 503
+
+def test_update_user():
+    login = client.post(
+        "/api/users/login",
+        json={"user": {"email": "test@example.com", "password": "password123"}}
+    )
+    token = login.json()["user"]["token"]
+    response = client.put(
+        "/api/users/",
+        json={"user": {"bio": "Updated bio"}},
+        headers={"Authorization": f"Token {token}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["user"]["bio"] == "Updated bio"
+
+def test_update_user_invalidates_cached_user():
+    from app.core.cache import token_cache
+    login = client.post(
+        "/api/users/login",
+        json={"user": {"email": "test@example.com", "password": "password123"}}
+    )
+    headers = {"Authorization": f"Token {login.json()['user']['token']}"}
+    client.put("/api/users/", json={"user": {"bio": "first"}}, headers=headers)
+    hits = token_cache.hits
+    response = client.put("/api/users/", json={"user": {"image": None, "bio": "second"}}, headers=headers)
+    assert token_cache.hits == hits + 1
+    assert response.json()["user"]["bio"] == "second"
+    response = client.put("/api/users/", json={"user": {"bio": "third"}}, headers=headers)
+    assert response.json()["user"]["bio"] == "third"
+
+def test_read_current_user_conditional_get():
+    login = client.post(
+        "/api/users/login",
+        json={"user": {"email": "test@example.com", "password": "password123"}}
+    )
+    headers = {"Authorization": f"Token {login.json()['user']['token']}"}
+    first = client.get("/api/users", headers=headers)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert client.get("/api/users", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.put("/api/users/", json={"user": {"bio": "conditional"}}, headers=headers)
+    changed = client.get("/api/users", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["user"]["bio"] == "conditional"
+
+def test_user_response_fast_path_matches_response_model():
+    response = client.post("/api/users/", json={"user": {
+        "username": "fastpath", "email": "FastPath@Example.COM", "password": "password123",
+        "bio": "Caf\u00e9 \u2713", "image": "HTTPS://Example.com/avatar.png",
+    }})
+    assert response.status_code == 200
+    data = response.json()["user"]
+    assert data["email"] == "FastPath@example.com"
+    assert data["image"] == "https://example.com/avatar.png"
+    assert response.content == UserResponseWrapper.model_validate(response.json()).model_dump_json().encode()
+
+def test_login_rehashes_password_at_configured_cost():
+    from passlib.hash import bcrypt
+    from sqlalchemy import insert, select
+    from app.core.config import settings
+    from app.db.models import User
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        db.execute(insert(User), {"username": "cheaphash", "email": "cheaphash@example.com",
+                                  "password": bcrypt.using(rounds=4).hash("password123")})
+        db.commit()
+
+    def stored_hash():
+        with SessionLocal() as db:
+            return db.scalar(select(User.password).where(User.username == "cheaphash"))
+
+    login = {"user": {"email": "cheaphash@example.com", "password": "wrong-password"}}
+    assert client.post("/api/users/login", json=login).status_code == 400
+    assert bcrypt.from_string(stored_hash()).rounds == 4
+
+    login["user"]["password"] = "password123"
+    assert client.post("/api/users/login", json=login).status_code == 200
+    rehashed = stored_hash()
+    assert bcrypt.from_string(rehashed).rounds == settings.BCRYPT_ROUNDS
+    assert client.post("/api/users/login", json=login).status_code == 200
+    assert stored_hash() == rehashed
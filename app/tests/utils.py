@@ -0,0 +1,26 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.db.session import async_engine
+
+@contextmanager
+def record_queries():
+    """Collect the SQL of every statement the block runs through the API engine."""
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+def count_queries(func):
+    with record_queries() as statements:
+        response = func()
+    return response, len(statements)
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Fail if the block runs more than limit statements through the API engine."""
+    with record_queries() as statements:
+        yield statements
+    assert len(statements) <= limit, f"{len(statements)} queries (limit {limit}):\n" + "\n".join(statements)
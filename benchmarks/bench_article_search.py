@@ -0,0 +1,86 @@
+"""Full-text article search vs a LIKE '%term%' scan on SQLite.
+
+Run with: python -m benchmarks.bench_article_search [articles] [queries]
+Uses a throwaway database; DATABASE_URL is overridden.
+"""
+import asyncio
+import random
+import sys
+import time
+
+from benchmarks.common import use_temp_database
+
+use_temp_database("bench_search.db")
+
+from sqlalchemy import func, insert, or_, select  # noqa: E402
+from sqlalchemy.orm import defer, joinedload, selectinload  # noqa: E402
+
+from app.crud.article import search_articles  # noqa: E402
+from app.db.base import init_db  # noqa: E402
+from app.db.models import Article, User  # noqa: E402
+from app.db.session import AsyncSessionLocal, SessionLocal  # noqa: E402
+
+WORDS = [f"word{i}" for i in range(5000)]
+
+
+def load(count: int):
+    init_db()
+    rng = random.Random(42)
+    with SessionLocal() as db:
+        db.execute(insert(User), [{"id": 1, "username": "bench", "email": "bench@example.com", "password": "x"}])
+        rows = [
+            {
+                "slug": f"article-{i}",
+                "title": " ".join(rng.choices(WORDS, k=6)),
+                "description": " ".join(rng.choices(WORDS, k=20)),
+                "body": " ".join(rng.choices(WORDS, k=400)),
+                "author_id": 1,
+            }
+            for i in range(count)
+        ]
+        db.execute(insert(Article), rows)
+        db.commit()
+
+
+async def like_search(db, term: str, limit: int = 20):
+    # Same response contract as search_articles (page + total), minus ranking
+    pattern = f"%{term}%"
+    condition = or_(Article.title.like(pattern), Article.description.like(pattern), Article.body.like(pattern))
+    result = await db.execute(
+        select(Article)
+        .where(condition)
+        .options(defer(Article.body), joinedload(Article.author), selectinload(Article.tags))
+        .order_by(Article.id.desc())
+        .limit(limit)
+    )
+    total = (await db.execute(select(func.count()).select_from(Article).where(condition))).scalar_one()
+    return result.scalars().all(), total
+
+
+async def measure(queries: int):
+    rng = random.Random(7)
+    terms = [rng.choice(WORDS) for _ in range(queries)]
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        for term in terms:
+            await search_articles(db, term)
+        fts = (time.perf_counter() - started) / queries
+        started = time.perf_counter()
+        for term in terms:
+            await like_search(db, term)
+        like = (time.perf_counter() - started) / queries
+    return fts, like
+
+
+def main():
+    articles = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    load(articles)
+    fts, like = asyncio.run(measure(queries))
+    print(f"{articles:,} articles, {queries} queries")
+    print(f"FTS (ranked, with count): {fts * 1000:8.2f} ms/query")
+    print(f"LIKE '%term%':            {like * 1000:8.2f} ms/query  ({like / fts:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
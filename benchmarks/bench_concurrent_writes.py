@@ -0,0 +1,83 @@
+"""POST /todos/ throughput from several worker processes sharing one SQLite file.
+
+Run with: python -m benchmarks.bench_concurrent_writes [workers] [requests_per_worker] [concurrency]
+Compares SQLite's stock settings (rollback journal, synchronous=FULL) with the
+tuned PRAGMAs from Settings, with and without group commit of todo creates.
+Each configuration gets its own throwaway database.
+Failed requests are mostly "database is locked" errors surfacing as 500s.
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import use_temp_database
+
+CONFIGS = {
+    "sqlite defaults": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_MMAP_SIZE": "0",
+        "SQLITE_CACHE_SIZE_KIB": "2000",
+    },
+    "tuned (Settings)": {},
+    "tuned + coalescing": {"TODO_WRITE_COALESCING": "true"},
+}
+
+
+async def run_worker(requests: int, concurrency: int, start_at: float) -> dict:
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    counts = {"ok": 0, "failed": 0}
+    counter = iter(range(requests))
+
+    async def client_task(client):
+        for i in counter:
+            response = await client.post("/todos/", json={"title": f"Write {i}", "description": "concurrent"})
+            counts["ok" if response.status_code == 200 else "failed"] += 1
+
+    await asyncio.sleep(max(0.0, start_at - time.time()))
+    started = time.time()
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await asyncio.gather(*(client_task(client) for _ in range(concurrency)))
+    return {**counts, "started": started, "finished": time.time()}
+
+
+def run_config(name: str, overrides: dict, workers: int, requests: int, concurrency: int):
+    use_temp_database("bench_concurrent_writes.db")
+    env = {**os.environ, **overrides, "DB_STARTUP": "none"}
+    subprocess.run([sys.executable, "-c", "from app.db.base import init_db; init_db()"], env=env, check=True)
+
+    start_at = time.time() + 3  # time for every worker to finish importing
+    args = [sys.executable, "-m", "benchmarks.bench_concurrent_writes", "--worker",
+            str(requests), str(concurrency), str(start_at)]
+    processes = [subprocess.Popen(args, env=env, stdout=subprocess.PIPE, text=True) for _ in range(workers)]
+    results = [json.loads(process.communicate()[0].strip().splitlines()[-1]) for process in processes]
+
+    ok = sum(result["ok"] for result in results)
+    failed = sum(result["failed"] for result in results)
+    elapsed = max(result["finished"] for result in results) - min(result["started"] for result in results)
+    print(f"{name:<20} {ok / elapsed:9.1f} writes/s   {failed:6d} failed of {ok + failed}   {elapsed:6.2f} s")
+
+
+def main():
+    if sys.argv[1:2] == ["--worker"]:
+        requests, concurrency, start_at = int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4])
+        print(json.dumps(asyncio.run(run_worker(requests, concurrency, start_at))))
+        return
+
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    print(f"{workers} workers x {requests} POST /todos/, {concurrency} in flight each")
+    for name, overrides in CONFIGS.items():
+        run_config(name, overrides, workers, requests, concurrency)
+
+
+if __name__ == "__main__":
+    main()
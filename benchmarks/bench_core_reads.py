@@ -0,0 +1,101 @@
+"""ORM hydration vs Core column rows for todo pages and user lookups.
+
+Run with: python -m benchmarks.bench_core_reads [page_size] [iterations]
+Uses a throwaway database; DATABASE_URL is overridden. Reports time per call
+and the peak Python memory allocated while one result is held.
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import use_temp_database
+
+use_temp_database("bench_core_reads.db")
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.crud.todo import get_todo_rows  # noqa: E402
+from app.crud.user import get_user_row_by_id  # noqa: E402
+from app.db.base import init_db  # noqa: E402
+from app.db.models import TodoItem, User  # noqa: E402
+from app.db.session import AsyncSessionLocal, SessionLocal  # noqa: E402
+
+USERS = 1000
+
+
+def load(todos: int):
+    init_db()
+    with SessionLocal() as db:
+        db.execute(insert(TodoItem), [
+            {"title": f"Todo {i}", "description": "Something to do " * 4, "completed": i % 3 == 0}
+            for i in range(todos)
+        ])
+        db.execute(insert(User), [
+            {"username": f"user{i}", "email": f"user{i}@example.com", "password": "x" * 60, "bio": "Bio " * 20}
+            for i in range(USERS)
+        ])
+        db.commit()
+
+
+# The ORM baselines the app no longer uses
+async def get_todo_items(db, skip: int, limit: int):
+    return (await db.execute(select(TodoItem).offset(skip).limit(limit))).scalars().all()
+
+
+async def get_user_by_id(db, user_id: int):
+    return await db.get(User, user_id)
+
+
+async def todo_page(crud, page_size: int):
+    # Fresh session per call, as a request would have
+    async with AsyncSessionLocal() as db:
+        return await crud(db, skip=0, limit=page_size)
+
+
+async def user_lookups(crud):
+    async with AsyncSessionLocal() as db:
+        return [await crud(db, user_id) for user_id in range(1, USERS + 1)]
+
+
+async def timed(factory, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await factory()
+    return (time.perf_counter() - started) / iterations
+
+
+async def peak_memory(factory) -> int:
+    tracemalloc.start()
+    try:
+        result = await factory()
+        _, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+async def measure(page_size: int, iterations: int):
+    cases = [
+        (f"todo page of {page_size:,} ORM", lambda: todo_page(get_todo_items, page_size), iterations),
+        (f"todo page of {page_size:,} Core", lambda: todo_page(get_todo_rows, page_size), iterations),
+        (f"{USERS:,} user lookups ORM", lambda: user_lookups(get_user_by_id), max(1, iterations // 4)),
+        (f"{USERS:,} user lookups Core", lambda: user_lookups(get_user_row_by_id), max(1, iterations // 4)),
+    ]
+    for name, factory, runs in cases:
+        await factory()  # warm up statement caches
+        elapsed = await timed(factory, runs)
+        peak = await peak_memory(factory)
+        print(f"{name:<28}  {elapsed * 1000:8.2f} ms   peak {peak / 1024:9.1f} KiB")
+
+
+def main():
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    load(page_size)
+    asyncio.run(measure(page_size, iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Home feed pages: follows x articles join at read time vs the fanned-out feed_entries.
+
+Run with: python -m benchmarks.bench_feed [users] [articles] [follows_per_user] [iterations]
+Uses a throwaway database; DATABASE_URL is overridden. Every user follows the same
+number of random authors; feed_entries holds what fan-out on write would have written.
+Both paths return the same article ids, which is checked before timing. Full pages
+include ORM hydration of the articles, authors and tags; "ids only" times just the
+statement that picks a page's article ids.
+"""
+import asyncio
+import random
+import sys
+import time
+
+from benchmarks.common import use_temp_database
+
+use_temp_database("bench_feed.db")
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import defer, joinedload, selectinload  # noqa: E402
+
+from app.crud.feed import feed_page_ids, feed_params, get_feed_articles  # noqa: E402
+from app.db.base import init_db  # noqa: E402
+from app.db.models import Article, User, feed_entries, follows  # noqa: E402
+from app.db.session import AsyncSessionLocal, SessionLocal  # noqa: E402
+
+PAGE = 20
+CHUNK = 5000
+
+
+def load(users: int, articles: int, per_user: int, seed: int = 42):
+    init_db()
+    rng = random.Random(seed)
+    followers = {author: [] for author in range(1, users + 1)}
+    follow_rows = []
+    for user_id in range(1, users + 1):
+        for author in rng.sample([u for u in range(1, users + 1) if u != user_id], per_user):
+            follow_rows.append({"follower_id": user_id, "followee_id": author})
+            followers[author].append(user_id)
+    article_rows = [
+        {"id": i, "slug": f"article-{i}", "title": f"Article {i}", "description": "D", "body": "B",
+         "author_id": rng.randint(1, users)}
+        for i in range(1, articles + 1)
+    ]
+    with SessionLocal() as db:
+        db.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password": "x",
+             "followers_count": len(followers[i])}
+            for i in range(1, users + 1)
+        ])
+        for table, rows in ((follows, follow_rows), (Article, article_rows)):
+            for start in range(0, len(rows), CHUNK):
+                db.execute(insert(table), rows[start:start + CHUNK])
+        entries = [{"user_id": follower, "article_id": row["id"]}
+                   for row in article_rows for follower in followers[row["author_id"]]]
+        for start in range(0, len(entries), CHUNK):
+            db.execute(insert(feed_entries), entries[start:start + CHUNK])
+        db.commit()
+    return len(entries)
+
+
+def join_page_ids(user_id: int, limit: int, before_id=None):
+    followees = select(follows.c.followee_id).where(follows.c.follower_id == user_id)
+    query = select(Article.id).where(Article.author_id.in_(followees))
+    if before_id is not None:
+        query = query.where(Article.id < before_id)
+    return query.order_by(Article.id.desc()).limit(limit + 1), {}
+
+
+def entries_page_ids(user_id: int, limit: int, before_id=None):
+    return feed_page_ids(before_id is not None), feed_params(user_id, limit, before_id)
+
+
+async def feed_on_read(db, user_id: int, limit: int = PAGE, before_id=None):
+    followees = select(follows.c.followee_id).where(follows.c.follower_id == user_id)
+    query = (
+        select(Article)
+        .options(defer(Article.body), joinedload(Article.author), selectinload(Article.tags))
+        .where(Article.author_id.in_(followees))
+    )
+    if before_id is not None:
+        query = query.where(Article.id < before_id)
+    result = await db.execute(query.order_by(Article.id.desc()).limit(limit + 1))
+    articles = result.scalars().all()
+    return articles[:limit], len(articles) > limit
+
+
+async def pages(crud, readers, depth: int):
+    """Walk `depth` pages of each reader's feed; returns the article ids seen."""
+    seen = []
+    async with AsyncSessionLocal() as db:
+        for user_id in readers:
+            before = None
+            for _ in range(depth):
+                articles, has_more = await crud(db, user_id=user_id, limit=PAGE, before_id=before)
+                seen.extend(article.id for article in articles)
+                if not has_more:
+                    break
+                before = articles[-1].id
+    return seen
+
+
+async def id_pages(statement, readers, depth: int):
+    """Like pages(), but only runs the id statement and keeps the cursor from its result."""
+    seen = []
+    async with AsyncSessionLocal() as db:
+        for user_id in readers:
+            before = None
+            for _ in range(depth):
+                query, params = statement(user_id, PAGE, before)
+                ids = sorted((await db.execute(query, params)).scalars(), reverse=True)
+                seen.extend(ids[:PAGE])
+                if len(ids) <= PAGE:
+                    break
+                before = ids[PAGE - 1]
+    return seen
+
+
+async def measure(users: int, iterations: int):
+    readers = random.Random(7).sample(range(1, users + 1), 50)
+    for depth in (1, 10):
+        assert await pages(feed_on_read, readers, depth) == await pages(get_feed_articles, readers, depth), "feeds differ"
+        for name, crud in (("join on read", feed_on_read), ("feed_entries", get_feed_articles)):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await pages(crud, readers, depth)
+            elapsed = (time.perf_counter() - started) / (iterations * len(readers) * depth)
+            print(f"{name:<13} pages 1-{depth:<3} {elapsed * 1000:8.3f} ms per page")
+        assert await id_pages(join_page_ids, readers, depth) == await id_pages(entries_page_ids, readers, depth), "ids differ"
+        for name, statement in (("join on read", join_page_ids), ("feed_entries", entries_page_ids)):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await id_pages(statement, readers, depth)
+            elapsed = (time.perf_counter() - started) / (iterations * len(readers) * depth)
+            print(f"{name:<13} pages 1-{depth:<3} {elapsed * 1000:8.3f} ms per page, ids only")
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    articles = int(sys.argv[2]) if len(sys.argv) > 2 else 30000
+    per_user = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    iterations = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+    entries = load(users, articles, per_user)
+    print(f"{users:,} users x {per_user} follows, {articles:,} articles, {entries:,} feed entries")
+    asyncio.run(measure(users, iterations))
+
+
+if __name__ == "__main__":
+    main()
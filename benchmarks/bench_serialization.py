@@ -0,0 +1,96 @@
+"""Todo page and user response serialisation: response_model validation vs the row fast path.
+
+Run with: python -m benchmarks.bench_serialization [todos] [iterations]
+Uses a throwaway database; DATABASE_URL is overridden. Each pair of paths is
+checked for byte-identical output before it is timed.
+"""
+import asyncio
+import sys
+import time
+from typing import List, Union
+
+from benchmarks.common import use_temp_database
+
+use_temp_database("bench_serialization.db")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.api.responses import dumps, orjson  # noqa: E402
+from app.api.routes.users import build_user_response  # noqa: E402
+from app.crud.todo import get_todo_rows_after  # noqa: E402
+from app.db.base import init_db  # noqa: E402
+from app.db.models import TodoItem, User  # noqa: E402
+from app.db.session import AsyncSessionLocal, SessionLocal  # noqa: E402
+from app.schemas.todo import TodoPage, TodoResponse  # noqa: E402
+from app.schemas.user import UserResponseWrapper  # noqa: E402
+
+# What FastAPI builds from response_model=Union[TodoPage, List[TodoResponse]]
+TODO_ADAPTER = TypeAdapter(Union[TodoPage, List[TodoResponse]])
+USER_ADAPTER = TypeAdapter(UserResponseWrapper)
+
+
+def load(count: int):
+    init_db()
+    with SessionLocal() as db:
+        db.execute(insert(TodoItem), [
+            {"title": f"Todo {i} café", "description": "Something to do " * 4, "completed": i % 3 == 0}
+            for i in range(count)
+        ])
+        db.commit()
+
+
+async def model_page(limit: int) -> bytes:
+    async with AsyncSessionLocal() as db:
+        # First keyset page as ORM objects, as read_todos did before the row fast path
+        items = (await db.execute(select(TodoItem).order_by(TodoItem.id).limit(limit))).scalars().all()
+        return TODO_ADAPTER.dump_json(TODO_ADAPTER.validate_python(TodoPage(items=items)))
+
+
+async def fast_page(limit: int) -> bytes:
+    async with AsyncSessionLocal() as db:
+        rows, _ = await get_todo_rows_after(db, limit=limit)
+        return dumps({"items": [row._asdict() for row in rows], "next_cursor": None})
+
+
+async def timed(func, iterations: int, *args) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await func(*args)
+    return (time.perf_counter() - started) / iterations
+
+
+async def measure_todos(iterations: int):
+    for limit in (10, 50, 100):
+        assert await model_page(limit) == await fast_page(limit), "outputs differ"
+        model = await timed(model_page, iterations, limit)
+        fast = await timed(fast_page, iterations, limit)
+        print(f"todos page of {limit:>3}: response_model {model * 1000:7.3f} ms   "
+              f"rows {fast * 1000:7.3f} ms   ({model / fast:.1f}x)")
+
+
+def measure_user(iterations: int):
+    user = User(id=1, username="bench", email="bench@example.com", bio="Café",
+                image="https://example.com/avatar.png", password="x")
+    user.token = "t" * 160
+    model = lambda: USER_ADAPTER.dump_json(USER_ADAPTER.validate_python({"user": user}))  # noqa: E731
+    fast = lambda: build_user_response(user, user.token).body  # noqa: E731
+    assert model() == fast(), "outputs differ"
+    for name, func in (("response_model", model), ("fast path", fast)):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        print(f"user response {name:<15} {(time.perf_counter() - started) / iterations * 1e6:8.2f} us")
+
+
+def main():
+    todos = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    load(todos)
+    print(f"encoder: {'orjson' if orjson is not None else 'pydantic'}")
+    asyncio.run(measure_todos(iterations))
+    measure_user(iterations * 20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Cold start: fresh interpreter to first served request, per DB_STARTUP mode.
+
+Run with: python -m benchmarks.bench_startup [runs]
+Uses a throwaway database migrated to head; DATABASE_URL is overridden.
+Each run is a new process, so nothing is warm but the OS page cache.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import use_temp_database
+
+use_temp_database("bench_startup.db")
+
+CHILD = """
+import time
+started = time.perf_counter()
+import asyncio
+import httpx
+from app.main import app
+imported = time.perf_counter()
+
+async def main():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            assert (await client.get("/todos/")).status_code == 200
+        served = time.perf_counter()
+    print(imported - started, ready - imported, served - ready)
+
+asyncio.run(main())
+"""
+
+
+def run_once(mode: str):
+    env = {**os.environ, "DB_STARTUP": mode}
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True)
+    total = time.perf_counter() - started
+    imported, startup, first_request = map(float, output.stdout.split())
+    return total, imported, startup, first_request
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    from alembic import command
+
+    from app.db.base import alembic_config
+    command.upgrade(alembic_config(), "head")
+
+    print(f"{'mode':<11} {'process':>9} {'import':>9} {'startup':>9} {'1st req':>9}   (median of {runs}, ms)")
+    for mode in ("check", "create_all", "none"):
+        samples = [run_once(mode) for _ in range(runs)]
+        medians = [statistics.median(column) * 1000 for column in zip(*samples)]
+        print(f"{mode:<11} " + " ".join(f"{value:9.1f}" for value in medians))
+
+
+if __name__ == "__main__":
+    main()
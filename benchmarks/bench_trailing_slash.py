@@ -0,0 +1,66 @@
+"""Requests/second through the trailing-slash middleware, old vs new.
+
+Run with: python -m benchmarks.bench_trailing_slash [requests]
+Both apps serve the same trivial route so the difference is middleware overhead.
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+from app.main import TrailingSlashMiddleware  # noqa: E402
+
+
+class BaseHTTPTrailingSlashMiddleware(BaseHTTPMiddleware):
+    # The previous implementation, kept here as the baseline
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if path != "/" and not path.endswith("/"):
+            request.scope["path"] = path + "/"
+        return await call_next(request)
+
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/todos/")
+    async def todos():
+        return [{"id": 1, "title": "Bench", "description": "", "completed": False}]
+
+    app.add_middleware(middleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int = 50) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(100):
+            await client.get("/todos")
+
+        async def worker(count: int):
+            for _ in range(count):
+                response = await client.get("/todos")
+                assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    before = asyncio.run(measure(build_app(BaseHTTPTrailingSlashMiddleware), requests))
+    after = asyncio.run(measure(build_app(TrailingSlashMiddleware), requests))
+    print(f"BaseHTTPMiddleware: {before:,.0f} req/s")
+    print(f"ASGI middleware:    {after:,.0f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+
+def use_temp_database(name: str = "bench.db") -> str:
+    """Point the app at a throwaway SQLite file. Call before importing app modules."""
+    url = f"sqlite:///{tempfile.mkdtemp(prefix='realworld-bench-')}/{name}"
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+    return url
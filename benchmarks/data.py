@@ -0,0 +1,91 @@
+"""Synthetic data for benchmarks, bulk-loaded with multi-row Core INSERTs.
+
+Core inserts bypass the ORM flush hooks, so tags.usage_count and
+articles.comments_count are computed here and written with the rows.
+"""
+import random
+from collections import Counter
+
+from sqlalchemy import insert
+
+from app.core.security.jwt import get_password_hash
+from app.db.base import init_db
+from app.db.models import Article, Comment, Tag, TodoItem, User, article_tags
+from app.db.session import SessionLocal
+
+PASSWORD = "password123"
+CHUNK = 5000
+WORDS = [f"word{i}" for i in range(2000)]
+
+
+def _insert(db, target, rows):
+    for start in range(0, len(rows), CHUNK):
+        db.execute(insert(target), rows[start:start + CHUNK])
+
+
+def load(scale: int = 1000, seed: int = 42) -> dict:
+    """Create users, todos, articles, tags and comments sized by scale.
+
+    Every user's password is PASSWORD. Returns the row counts.
+    """
+    init_db()
+    rng = random.Random(seed)
+    # One hash for everyone; hashing per user would dominate load time
+    password = get_password_hash(PASSWORD)
+
+    counts = {
+        "users": scale,
+        "todos": scale * 10,
+        "articles": scale,
+        "tags": max(10, scale // 10),
+        "comments": scale * 3,
+    }
+    text = lambda k: " ".join(rng.choices(WORDS, k=k))  # noqa: E731
+
+    users = [
+        {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password": password, "bio": text(8)}
+        for i in range(1, counts["users"] + 1)
+    ]
+    todos = [
+        {"title": text(4), "description": text(12), "completed": rng.random() < 0.3}
+        for _ in range(counts["todos"])
+    ]
+
+    links = set()
+    for article_id in range(1, counts["articles"] + 1):
+        for tag_id in rng.sample(range(1, counts["tags"] + 1), k=rng.randint(1, 3)):
+            links.add((article_id, tag_id))
+    tag_usage = Counter(tag_id for _, tag_id in links)
+
+    comments = [
+        {"body": text(30), "author_id": rng.randint(1, counts["users"]), "article_id": rng.randint(1, counts["articles"])}
+        for _ in range(counts["comments"])
+    ]
+    comment_counts = Counter(comment["article_id"] for comment in comments)
+
+    tags = [
+        {"id": i, "name": f"tag{i}", "usage_count": tag_usage[i]}
+        for i in range(1, counts["tags"] + 1)
+    ]
+    articles = [
+        {
+            "id": i,
+            "slug": f"article-{i}",
+            "title": text(6),
+            "description": text(20),
+            "body": text(300),
+            "author_id": rng.randint(1, counts["users"]),
+            "comments_count": comment_counts[i],
+        }
+        for i in range(1, counts["articles"] + 1)
+    ]
+
+    with SessionLocal() as db:
+        _insert(db, User, users)
+        _insert(db, TodoItem, todos)
+        _insert(db, Tag, tags)
+        _insert(db, Article, articles)
+        _insert(db, article_tags, [{"article_id": a, "tag_id": t} for a, t in sorted(links)])
+        _insert(db, Comment, comments)
+        db.commit()
+    return counts
@@ -0,0 +1,187 @@
+"""In-process API benchmarks over httpx's ASGI transport against local SQLite.
+
+    python -m benchmarks.harness --scale 1000 --save benchmarks/baseline.json
+    python -m benchmarks.harness --scale 1000 --compare benchmarks/baseline.json
+
+Each scenario reports throughput and p50/p95/p99 latency. --compare exits
+non-zero when a scenario's throughput drops or its p95 grows by more than
+--tolerance relative to the baseline.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from benchmarks.common import use_temp_database
+
+use_temp_database()
+
+import httpx  # noqa: E402
+
+from app.core.security.jwt import create_access_token  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks import data  # noqa: E402
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, request: Request, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            response = await request(client, i)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{response.request.method} {response.request.url} -> "
+                                   f"{response.status_code}: {response.text[:200]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+def build_scenarios(counts: dict, run_id: str) -> Dict[str, Request]:
+    rng = random.Random(1)
+    users = counts["users"]
+    tokens = {i: create_access_token({"sub": str(i)}) for i in range(1, users + 1)}
+    cursors: Dict[int, str] = {}
+    # Warm-up and measured runs share request indices; registrations need fresh names
+    registrations = itertools.count()
+
+    def auth(i: int) -> dict:
+        return {"Authorization": f"Token {tokens[i % users + 1]}"}
+
+    async def register(client, i):
+        name = f"bench-{run_id}-{next(registrations)}"
+        return await client.post("/api/users/", json={"user": {
+            "username": name, "email": f"{name}@example.com", "password": data.PASSWORD,
+        }})
+
+    async def login(client, i):
+        return await client.post("/api/users/login", json={"user": {
+            "email": f"user{i % users + 1}@example.com", "password": data.PASSWORD,
+        }})
+
+    async def update_profile(client, i):
+        return await client.put("/api/users/", json={"user": {"bio": f"bio {i}"}}, headers=auth(i))
+
+    async def create_todo(client, i):
+        return await client.post("/todos/", json={"title": f"Bench {i}", "description": "benchmark"})
+
+    async def list_todos_offset(client, i):
+        return await client.get("/todos/", params={"skip": rng.randrange(counts["todos"]), "limit": 20})
+
+    async def list_todos_cursor(client, i):
+        # Each worker slot walks forward through the table, restarting at the end
+        slot = i % 16
+        response = await client.get("/todos/", params={"cursor": cursors.get(slot, ""), "limit": 20})
+        cursors[slot] = response.json().get("next_cursor") or ""
+        return response
+
+    return {
+        "register": register,
+        "login": login,
+        "update_profile": update_profile,
+        "create_todo": create_todo,
+        "list_todos_offset": list_todos_offset,
+        "list_todos_cursor": list_todos_cursor,
+    }
+
+
+# bcrypt-bound scenarios get fewer requests so a run stays short
+BCRYPT_SCENARIOS = {"register", "login"}
+
+
+async def run(args) -> dict:
+    counts = data.load(scale=args.scale)
+    scenarios = build_scenarios(counts, run_id=str(int(time.time())))
+    selected = args.scenario or list(scenarios)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in selected:
+            requests = args.bcrypt_requests if name in BCRYPT_SCENARIOS else args.requests
+            await run_scenario(client, scenarios[name], min(requests, 20), args.concurrency)  # warm up
+            results[name] = await run_scenario(client, scenarios[name], requests, args.concurrency)
+            print_result(name, results[name])
+    return {
+        "meta": {
+            "scale": args.scale,
+            "counts": counts,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def print_result(name: str, result: dict):
+    print(f"{name:<20} {result['throughput_rps']:>9.1f} req/s  "
+          f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms")
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        if result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['throughput_rps']:.1f} < "
+                               f"baseline {base['throughput_rps']:.1f} req/s")
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']:.2f} > baseline {base['p95_ms']:.2f} ms")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1000, help="users/articles; todos are 10x, comments 3x")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--bcrypt-requests", type=int, default=40, help="requests for register/login")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenario", action="append", help="run only these scenarios")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())